@@ -104,9 +104,10 @@ impl BmsWrapper {
                 }
                 (Grounded::Class(ref cls), ..) => {
                     let cls = cls.upgrade().unwrap();
+                    let bms = cls.bms.as_ref().unwrap();
                     let mut ask = false;
                     {
-                        let lock = &*cls.bms.as_ref().unwrap().records.read().unwrap();
+                        let lock = &*bms.records.read().unwrap();
                         let last = lock.last().unwrap();
                         if last.time > *cmp_rec {
                             ask = true;
@@ -118,7 +119,6 @@ impl BmsWrapper {
                                 .unwrap()
                                 .get_results_single();
                         if answ.is_none() {
-                            let bms = cls.bms.as_ref().unwrap();
                             let mut time: Option<Time> = None;
                             let mut value: Option<f32> = None;
                             {
@@ -144,10 +144,7 @@ impl BmsWrapper {
         if data.overwrite.load(Ordering::Acquire) {
             let old_recs;
             {
-                let mut new_recs: Vec<BmsRecord> = vec![];
-                for rec in &*data.records.read().unwrap() {
-                    new_recs.push(rec.clone())
-                }
+                let mut new_recs: Vec<BmsRecord> = data.records.read().unwrap().clone();
                 let prev_recs = &mut *self.records.write().unwrap();
                 mem::swap(prev_recs, &mut new_recs);
                 old_recs = new_recs;
@@ -226,16 +223,14 @@ impl BmsWrapper {
     fn cleanup_records(&self) {
         let records = &mut *self.records.write().unwrap();
         let l = records.len() - 2;
-        let mut remove_ls: Vec<usize> = vec![];
-        for (i, rec) in records[..l].iter().enumerate() {
-            if rec.produced.is_empty() && rec.was_produced.is_some() {
-                remove_ls.push(i);
-            }
-        }
-        remove_ls.reverse();
-        for pos in remove_ls {
-            records.remove(pos);
-        }
+        // drop the records in a single pass instead of shifting the tail once per removal
+        let mut i = 0;
+        records.retain(|rec| {
+                           let keep = i >= l || !rec.produced.is_empty() ||
+                                      rec.was_produced.is_none();
+                           i += 1;
+                           keep
+                       });
     }
 
     fn add_entry(&self, produced: Grounded, with_val: Option<f32>) {
@@ -267,13 +262,18 @@ impl BmsWrapper {
     }
 
     pub fn overwrite_data(&self, other: &BmsWrapper) {
-        let mut lock = &mut *self.records.write().unwrap();
-        // drop old records
-        lock.truncate(0);
-        // insert new records
-        for rec in &*other.records.read().unwrap() {
-            lock.push(rec.clone())
-        }
+        let lock = &mut *self.records.write().unwrap();
+        // replace the old records in one go, reusing the current allocation
+        lock.clone_from(&*other.records.read().unwrap());
+        self.overwrite.store(other.overwrite.load(Ordering::Acquire), Ordering::Release);
+    }
+
+    /// Same as `overwrite_data`, but the last record copied is set to the given value
+    /// while the lock is still held.
+    pub fn overwrite_data_with_val(&self, other: &BmsWrapper, val: Option<f32>) {
+        let lock = &mut *self.records.write().unwrap();
+        lock.clone_from(&*other.records.read().unwrap());
+        lock.last_mut().unwrap().value = val;
         self.overwrite.store(other.overwrite.load(Ordering::Acquire), Ordering::Release);
     }
 
@@ -297,12 +297,6 @@ impl BmsWrapper {
         rec.time
     }
 
-    pub fn replace_last_val(&self, val: Option<f32>) {
-        let records = &mut *self.records.write().unwrap();
-        let last = records.last_mut().unwrap();
-        last.value = val;
-    }
-
     pub fn last_was_produced(&self, produced: Option<SentID>) {
         let records = &mut *self.records.write().unwrap();
         let last = records.last_mut().unwrap();
@@ -23,7 +23,7 @@ use std::iter::FromIterator;
 use std::mem;
 use std::rc::Rc;
 use std::sync::{Mutex, RwLock, Arc};
-use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::atomic::{AtomicBool, AtomicUsize, Ordering};
 
 use rayon;
 use rayon::prelude::*;
@@ -127,14 +127,7 @@ impl<'b> InfResults<'b> {
                 for members in preds.values() {
                     for gr in members {
                         let gr = &*(&**gr as *const GroundedMemb) as &'b GroundedMemb;
-                        if res.contains_key(gr.get_name()) {
-                            let prev = res.get_mut(gr.get_name()).unwrap();
-                            prev.push(gr);
-                        } else {
-                            let mut new = vec![];
-                            new.push(gr);
-                            res.insert(gr.get_name(), new);
-                        }
+                        res.entry(gr.get_name()).or_insert_with(Vec::new).push(gr);
                     }
                 }
             }
@@ -151,14 +144,9 @@ impl<'b> InfResults<'b> {
                     for grfunc in relation_ls {
                         for name in grfunc.get_args_names() {
                             let name = mem::transmute::<&str, &'b str>(name);
-                            if res.contains_key(name) {
-                                let prev = res.get_mut(name).unwrap();
-                                prev.insert(&**grfunc as *const GroundedFunc);
-                            } else {
-                                let mut new = HashSet::new();
-                                new.insert(&**grfunc as *const GroundedFunc);
-                                res.insert(name, new);
-                            }
+                            res.entry(name)
+                                .or_insert_with(HashSet::new)
+                                .insert(&**grfunc as *const GroundedFunc);
                         }
                     }
                 }
@@ -180,7 +168,14 @@ pub(crate) struct Inference<'a> {
     depth: usize,
     ignore_current: bool,
     nodes: RwLock<HashMap<&'a str, Vec<ProofNode<'a>>>>,
+    // rules already turned into proof nodes
+    rules: Mutex<HashSet<SentID>>,
     queue: RwLock<HashMap<usize, HashSet<PArgVal>>>, // K: *const ProofNode<'a>
+    // substitutions which did not prove anything since the last result of any trial,
+    // shared so an update from one trial invalidates the failures of all of them
+    failed: RwLock<HashMap<usize, HashSet<PArgVal>>>, // K: *const ProofNode<'a>
+    // number of times `failed` has been invalidated
+    failed_gen: AtomicUsize,
     results: InfResults<'a>,
     tpool: rayon::ThreadPool,
 }
@@ -200,7 +195,10 @@ impl<'a> Inference<'a> {
                depth: depth,
                ignore_current: ignore_current,
                nodes: RwLock::new(HashMap::new()),
+               rules: Mutex::new(HashSet::new()),
                queue: RwLock::new(HashMap::new()),
+               failed: RwLock::new(HashMap::new()),
+               failed_gen: AtomicUsize::new(0),
                results: InfResults::new(query),
                tpool: rayon::ThreadPool::new(config).unwrap(),
            })
@@ -232,16 +230,19 @@ impl<'a> Inference<'a> {
         pass.get_rules(vec![query]);
         // run the query, if there is no result and there is an update,
         // then loop again, else stop
+        // the work buffers are reused between passes instead of reallocated
+        let mut chk = VecDeque::new();
+        let mut done = HashSet::new();
         loop {
-            pass.unify(query, VecDeque::new(), HashSet::new());
-            {
-                let lock0 = pass.updated.lock().unwrap();
-                let lock1 = pass.feedback.load(Ordering::SeqCst);
-                if !lock0.contains(&true) || !lock1 {
-                    break;
-                }
+            chk.clear();
+            done.clear();
+            pass.unify(query, &mut chk, &mut done);
+            let mut lock0 = pass.updated.lock().unwrap();
+            let lock1 = pass.feedback.load(Ordering::SeqCst);
+            if !lock0.contains(&true) || !lock1 {
+                break;
             }
-            pass.updated = Mutex::new(vec![]);
+            lock0.clear();
         }
         let obj = actv_query.get_obj();
         let pred = actv_query.get_pred();
@@ -263,13 +264,14 @@ impl<'a> Inference<'a> {
             .cls_queries_grounded
             .par_iter()
             .for_each(|(obj, preds)| {
-                for pred in preds {
+                // all the classes of the same object are checked with a single kb lookup
+                let results = if !self.ignore_current {
+                    self.kb.class_memberships(obj, preds)
+                } else {
+                    vec![None; preds.len()]
+                };
+                for (pred, result) in preds.iter().zip(results) {
                     let query = pred.get_parent();
-                    let result = if !self.ignore_current {
-                        self.kb.class_membership(pred)
-                    } else {
-                        None
-                    };
                     if result.is_some() {
                         self.results
                             .add_grounded(obj, query, Some((result.unwrap(), None)));
@@ -402,30 +404,6 @@ impl ActiveQuery {
             ActiveQuery::Func(_, ref decl) => decl.get_name(),
         }
     }
-
-    #[inline]
-    fn is_func(&self) -> bool {
-        match *self {
-            ActiveQuery::Class(..) => false,
-            ActiveQuery::Func(..) => true,
-        }
-    }
-
-    #[inline]
-    fn get_func(&self) -> &GroundedFunc {
-        match *self {
-            ActiveQuery::Func(_, ref gf) => &*gf,
-            ActiveQuery::Class(_) => panic!(),
-        }
-    }
-
-    #[inline]
-    fn get_cls(&self) -> &GroundedMemb {
-        match *self {
-            ActiveQuery::Class(ref gt) => &*gt,
-            ActiveQuery::Func(_, _) => panic!(),
-        }
-    }
 }
 
 #[derive(Debug)]
@@ -437,8 +415,7 @@ struct ProofArgs {
 type PArgVal = usize;
 
 impl ProofArgs {
-    fn new<'a>(input: Vec<(&Var, Arc<VarAssignment<'a>>)>) -> ProofArgs {
-        let hash_val = ProofArgs::arg_hash_val(&input[..]);
+    fn new<'a>(input: Vec<(&Var, Arc<VarAssignment<'a>>)>, hash_val: PArgVal) -> ProofArgs {
         let ptr = Box::into_raw(Box::new(input));
         ProofArgs {
             ptr: ptr as usize,
@@ -446,24 +423,22 @@ impl ProofArgs {
         }
     }
 
-    fn arg_hash_val(input: &[(&Var, Arc<VarAssignment>)]) -> usize {
+    fn arg_hash_val(input: &[(&Var, Arc<VarAssignment>)]) -> PArgVal {
         use std::collections::hash_map::DefaultHasher;
-        let mut v = vec![];
+        let mut s = DefaultHasher::new();
         for &(var, ref assigned) in input {
-            let mut var = format!("{:?}", var as *const Var).into_bytes();
-            v.append(&mut var);
-            let mut s = Vec::from_iter(assigned.name.as_bytes().iter().cloned());
-            v.append(&mut s);
+            (var as *const Var as usize).hash(&mut s);
+            assigned.name.hash(&mut s);
         }
-        let mut s = DefaultHasher::new();
-        v.hash(&mut s);
         s.finish() as usize
     }
 
-    fn as_proof_input(&self) -> HashMap<&Var, &VarAssignment> {
+    /// The assignments live in the heap until the args are dropped, so the map
+    /// is not tied to the borrow of the args.
+    fn as_proof_input<'b>(&self) -> HashMap<&'b Var, &'b VarAssignment<'b>> {
         let data = unsafe {
             let data = self.ptr as *mut Vec<(&Var, Arc<VarAssignment>)>;
-            &*data as &Vec<(&Var, Arc<VarAssignment>)>
+            &*data as &Vec<(&'b Var, Arc<VarAssignment<'b>>)>
         };
         let mut n_args = HashMap::with_capacity(data.len());
         for &(k, ref v) in data {
@@ -478,7 +453,11 @@ impl ::std::clone::Clone for ProofArgs {
         unsafe {
             let data = self.ptr as *mut Vec<(&Var, Arc<VarAssignment>)>;
             let data = &*data as &Vec<(&Var, Arc<VarAssignment>)>;
-            ProofArgs::new(data.clone())
+            let ptr = Box::into_raw(Box::new(data.clone()));
+            ProofArgs {
+                ptr: ptr as usize,
+                hash_val: self.hash_val,
+            }
         }
     }
 }
@@ -600,8 +579,13 @@ struct InfTrial<'a> {
     updated: Mutex<Vec<bool>>,
     feedback: AtomicBool,
     valid: Mutex<Option<ValidAnswer>>,
+    // classes whose rules were already expanded into proof nodes
+    expanded: Mutex<HashSet<&'a str>>,
+    rules: &'a Mutex<HashSet<SentID>>,
     nodes: usize, // &'a RwLock<HashMap<&'a str, Vec<ProofNode<'a>>>>,
     queue: &'a RwLock<HashMap<usize, HashSet<PArgVal>>>, // K: *const ProofNode<'a>
+    failed: &'a RwLock<HashMap<usize, HashSet<PArgVal>>>, // K: *const ProofNode<'a>
+    failed_gen: &'a AtomicUsize,
     results: usize, // &'a InfResults<'a>,
     depth: usize,
     depth_cnt: RwLock<usize>,
@@ -618,8 +602,12 @@ impl<'a> InfTrial<'a> {
             updated: Mutex::new(vec![]),
             feedback: AtomicBool::new(true),
             valid: Mutex::new(None),
+            expanded: Mutex::new(HashSet::new()),
+            rules: &inf.rules,
             nodes: nodes,
             queue: &inf.queue,
+            failed: &inf.failed,
+            failed_gen: &inf.failed_gen,
             results: results,
             depth: inf.depth,
             depth_cnt: RwLock::new(0_usize),
@@ -627,20 +615,18 @@ impl<'a> InfTrial<'a> {
         }
     }
 
-    fn unify(&self, mut parent: &'a str, mut chk: VecDeque<&'a str>, mut done: HashSet<&'a str>) {
+    fn unify(&self,
+             mut parent: &'a str,
+             chk: &mut VecDeque<&'a str>,
+             done: &mut HashSet<&'a str>) {
 
         fn scoped_exec(inf: &InfTrial, node: &ProofNode, args: ProofArgs) {
             let node_raw = node as *const ProofNode as usize;
-            let args_done = {
-                if let Some(queued) = inf.queue.read().unwrap().get(&node_raw) {
-                    queued.contains(&args.hash_val)
-                } else {
-                    false
-                }
-            };
-            if !args_done {
-                let n_args = args.as_proof_input();
-                let mut context = IExprResult::new(args.clone(), node);
+            if !inf.is_memoized(node_raw, args.hash_val) {
+                let hash_val = args.hash_val;
+                let gen = inf.failed_gen.load(Ordering::SeqCst);
+                let mut context = IExprResult::new(args, node);
+                let n_args = context.args.as_proof_input();
                 node.proof.solve(inf.kb, Some(n_args), &mut context);
                 if context.result.is_some() {
                     {
@@ -650,13 +636,26 @@ impl<'a> InfTrial<'a> {
                         lock1
                             .entry(node_raw)
                             .or_insert(HashSet::new())
-                            .insert(args.hash_val);
+                            .insert(hash_val);
+                        // the KB may have changed, previous failures of any trial
+                        // could hold now
+                        let mut failed = inf.failed.write().unwrap();
+                        inf.failed_gen.fetch_add(1, Ordering::SeqCst);
+                        failed.clear();
                     }
                     inf.add_result(context);
+                } else {
+                    let mut failed = inf.failed.write().unwrap();
+                    // don't record a failure solved against a KB which has changed since
+                    if inf.failed_gen.load(Ordering::SeqCst) == gen {
+                        failed.entry(node_raw).or_insert(HashSet::new()).insert(hash_val);
+                    }
                 }
             }
         };
 
+        // mirrors the contents of chk for constant time membership checks
+        let mut queued: HashSet<&'a str> = HashSet::from_iter(chk.iter().cloned());
         loop {
             {
                 *self.valid.lock().unwrap() = None;
@@ -673,12 +672,12 @@ impl<'a> InfTrial<'a> {
                     // recursively try unifying all possible argument with the
                     // operating logic sentence:
                     // get all the entities/classes from the kb that meet the proof requeriments
-                    for var_req in node.proof.get_lhs_predicates().into_sent_req() {
-                        let assignments = meet_sent_req(self.kb, &var_req);
+                    for var_req in &node.var_reqs {
+                        let assignments = meet_sent_req(self.kb, var_req);
                         if assignments.is_none() {
-                            for e in node.antecedents.clone() {
-                                if !done.contains(&e) && !chk.contains(&e) {
-                                    chk.push_back(e);
+                            for e in &node.antecedents {
+                                if !done.contains(e) && queued.insert(*e) {
+                                    chk.push_back(*e);
                                 }
                             }
                             continue;
@@ -686,20 +685,27 @@ impl<'a> InfTrial<'a> {
                         // lazily iterate over all possible combinations of the substitutions
                         let mapped = ArgsProduct::product(assignments.unwrap());
                         if let Some(mapped) = mapped {
+                            let node_raw = &*node as *const ProofNode as usize;
                             for args in mapped {
                                 if let Some(ref valid) = *self.valid.lock().unwrap() {
-                                    if valid.node == &*node as *const ProofNode as usize {
+                                    if valid.node == node_raw {
                                         break;
                                     }
                                 }
-                                let args: ProofArgs = ProofArgs::new(args);
+                                // don't dispatch substitutions already tried for this node,
+                                // the hash is computed once and moved into the args
+                                let hash_val = ProofArgs::arg_hash_val(&args[..]);
+                                if self.is_memoized(node_raw, hash_val) {
+                                    continue;
+                                }
+                                let args = ProofArgs::new(args, hash_val);
                                 self.tpool.install(|| scoped_exec(self, node, args));
                             }
                         }
                         if self.feedback.load(Ordering::SeqCst) {
-                            for e in node.antecedents.clone() {
-                                if !done.contains(&e) && !chk.contains(&e) {
-                                    chk.push_back(e);
+                            for e in &node.antecedents {
+                                if !done.contains(e) && queued.insert(*e) {
+                                    chk.push_back(*e);
                                 }
                             }
                         }
@@ -711,8 +717,9 @@ impl<'a> InfTrial<'a> {
             }
             if !chk.is_empty() && (*self.depth_cnt.read().unwrap() < self.depth) {
                 done.insert(parent);
-                self.get_rules(Vec::from_iter(chk.iter().cloned()));
+                self.get_rules(chk.iter().cloned());
                 let p1 = chk.pop_front().unwrap();
+                queued.remove(p1);
                 parent = p1;
             } else {
                 let mut c = self.depth_cnt.write().unwrap();
@@ -746,128 +753,111 @@ impl<'a> InfTrial<'a> {
         *lock = Some(answ);
     }
 
+    fn is_memoized(&self, node_raw: usize, hash_val: PArgVal) -> bool {
+        let memoized = |memo: &HashMap<usize, HashSet<PArgVal>>| {
+            memo.get(&node_raw).map_or(false, |m| m.contains(&hash_val))
+        };
+        memoized(&*self.queue.read().unwrap()) || memoized(&*self.failed.read().unwrap())
+    }
+
     fn add_result(&self, mut context: IExprResult) {
         // add category/function to the object dictionary
         // and to results dict if is the result for the query
-        let query_obj = self.actv.get_obj();
-        let query_pred = self.actv.get_pred();
-        let is_func = self.actv.is_func();
-        let results = unsafe { &*(self.results as *const InfResults) };
-
-        let gr_cls: Vec<_> = context.grounded_cls.drain(..).collect();
-        for (gt, time) in gr_cls {
-            if !is_func {
-                let query_cls = self.actv.get_cls();
-                if query_cls.comparable(&gt) {
-                    let val = query_cls == &gt;
-                    let mut d = results.grounded_queries.write().unwrap();
-                    let mut gr_results_dict = {
-                        if d.contains_key(query_pred) {
-                            d.get_mut(query_pred).unwrap()
-                        } else {
-                            let new = HashMap::new();
-                            d.insert(query_pred.to_string(), new);
-                            d.get_mut(query_pred).unwrap()
-                        }
-                    };
-                    if gr_results_dict.contains_key(query_obj) {
-                        let cond_ok;
-                        if let Some(&Some((_, Some(ref cdate)))) = gr_results_dict.get(query_obj) {
-                            if &time >= cdate {
-                                cond_ok = true;
-                            } else {
-                                cond_ok = false;
-                            }
-                        } else {
-                            cond_ok = true;
-                        }
-                        if cond_ok {
-                            self.add_as_last_valid(&context, gr_results_dict, time, val);
-                        }
-                    } else {
-                        self.add_as_last_valid(&context, gr_results_dict, time, val);
+        // only the results of the same kind as the active query are relevant
+        match self.actv {
+            ActiveQuery::Class(ref query_cls) => {
+                let gr_cls = mem::replace(&mut context.grounded_cls, vec![]);
+                for (gt, time) in gr_cls {
+                    if query_cls.comparable(&gt) {
+                        let val = **query_cls == gt;
+                        self.update_grounded_result(&context, time, val);
                     }
-                    self.feedback.store(false, Ordering::SeqCst);
                 }
             }
-        }
-
-        let gr_func: Vec<_> = context.grounded_func.drain(..).collect();
-        for (gf, time) in gr_func {
-            if is_func {
-                let query_func = self.actv.get_func();
-                if query_func.comparable(&gf) {
-                    let val = query_func == &gf;
-                    let mut d = results.grounded_queries.write().unwrap();
-                    let mut gr_results_dict = {
-                        if d.contains_key(query_pred) {
-                            d.get_mut(query_pred).unwrap()
-                        } else {
-                            let new = HashMap::new();
-                            d.insert(query_pred.to_string(), new);
-                            d.get_mut(query_pred).unwrap()
-                        }
-                    };
-                    if gr_results_dict.contains_key(query_obj) {
-                        let cond_ok;
-                        if let Some(&Some((_, Some(ref cdate)))) = gr_results_dict.get(query_obj) {
-                            if &time >= cdate {
-                                cond_ok = true;
-                            } else {
-                                cond_ok = false;
-                            }
-                        } else {
-                            cond_ok = true;
-                        }
-                        if cond_ok {
-                            self.add_as_last_valid(&context, gr_results_dict, time, val);
-                        }
-                    } else {
-                        self.add_as_last_valid(&context, gr_results_dict, time, val);
+            ActiveQuery::Func(_, ref query_func) => {
+                let gr_func = mem::replace(&mut context.grounded_func, vec![]);
+                for (gf, time) in gr_func {
+                    if query_func.comparable(&gf) {
+                        let val = **query_func == gf;
+                        self.update_grounded_result(&context, time, val);
                     }
-                    self.feedback.store(false, Ordering::SeqCst);
                 }
             }
         }
     }
 
-    fn get_rules(&self, cls_ls: Vec<&str>) {
-        let nodes = unsafe { &*(self.nodes as *const RwLock<HashMap<&str, Vec<ProofNode>>>) };
-        let mut rules: HashSet<Arc<LogSentence>> = HashSet::new();
-        for vrules in nodes.read().unwrap().values() {
-            for r in vrules {
-                rules.insert(r.proof.clone());
-            }
+    fn update_grounded_result(&self, context: &IExprResult, time: Time, val: bool) {
+        let query_obj = self.actv.get_obj();
+        let query_pred = self.actv.get_pred();
+        let results = unsafe { &*(self.results as *const InfResults) };
+        let mut d = results.grounded_queries.write().unwrap();
+        if !d.contains_key(query_pred) {
+            d.insert(query_pred.to_string(), HashMap::new());
         }
+        let gr_results_dict = d.get_mut(query_pred).unwrap();
+        // only replace a previous answer if this one is at least as recent
+        let cond_ok = match gr_results_dict.get(query_obj) {
+            Some(&Some((_, Some(ref cdate)))) => &time >= cdate,
+            _ => true,
+        };
+        if cond_ok {
+            self.add_as_last_valid(context, gr_results_dict, time, val);
+        }
+        self.feedback.store(false, Ordering::SeqCst);
+    }
+
+    fn get_rules<I: IntoIterator<Item = &'a str>>(&self, cls_ls: I) {
+        let nodes = unsafe { &*(self.nodes as *const RwLock<HashMap<&str, Vec<ProofNode>>>) };
+        // acquire the locks once for the whole expansion instead of once per class/predicate
+        let mut nodes = nodes.write().unwrap();
+        let classes = self.kb.classes.read().unwrap();
+        let mut expanded = self.expanded.lock().unwrap();
+        let mut rules = self.rules.lock().unwrap();
         for cls in cls_ls {
-            if let Some(stored) = self.kb.classes.read().unwrap().get(cls) {
-                let comp: HashSet<Arc<LogSentence>> = {
-                    let lock = stored.beliefs.read().unwrap();
-                    if let Some(beliefs) = lock.get(cls) {
-                        HashSet::from_iter(beliefs.iter().cloned())
-                    } else {
-                        HashSet::new()
-                    }
+            // the beliefs of a class don't change while inferring,
+            // so each class only needs to be expanded once
+            if !expanded.insert(cls) {
+                continue;
+            }
+            if let Some(stored) = classes.get(cls) {
+                let lock = stored.beliefs.read().unwrap();
+                let beliefs = match lock.get(cls) {
+                    Some(beliefs) => beliefs,
+                    None => continue,
                 };
-                for sent in comp.difference(&rules) {
+                for sent in beliefs {
+                    if !rules.insert(sent.get_id()) {
+                        continue;
+                    }
                     let mut antecedents = vec![];
                     for p in sent.get_all_lhs_predicates() {
                         let p = unsafe { &*(p as *const Assert) as &'a Assert };
                         antecedents.push(p.get_name())
                     }
                     let node = ProofNode::new(sent.clone(), antecedents);
+                    // the rule is new, so it only has to be checked against the
+                    // predicates repeated in its own consequent
+                    let mut consequents: Vec<&'a str> = vec![];
                     for pred in sent.get_rhs_predicates() {
                         let pred = unsafe { &*(pred as *const Assert) as &'a Assert };
                         let name = pred.get_name();
-                        let mut lock = nodes.write().unwrap();
-                        let mut ls = lock.entry(name).or_insert(vec![]);
-                        if ls.iter()
-                               .map(|x| x.proof.get_id())
-                               .find(|x| *x == sent.get_id())
-                               .is_none() {
-                            ls.push(node.clone());
+                        if consequents.contains(&name) {
+                            continue;
                         }
-                        ls.sort_by(|a, b| a.proof.created.cmp(&b.proof.created).reverse());
+                        consequents.push(name);
+                        let mut ls = nodes.entry(name).or_insert(vec![]);
+                        // keep the list sorted from newest to oldest, after any
+                        // node created at the same time
+                        let pos = ls.binary_search_by(|x| {
+                                use std::cmp::Ordering::{Less, Greater};
+                                if x.proof.created >= sent.created {
+                                    Less
+                                } else {
+                                    Greater
+                                }
+                            })
+                            .unwrap_or_else(|pos| pos);
+                        ls.insert(pos, node.clone());
                     }
                 }
             }
@@ -906,17 +896,26 @@ pub(crate) fn meet_sent_req<'a>(rep: &'a Representation,
         };
         // meet_cls_req: HashMap<&str, Vec<Arc<GroundedMemb>>>
         let meet_cls_req = rep.by_class(class_list);
+        // if any class has no members the requeriments can't be met by any object
+        if class_list.iter().any(|c| meet_cls_req.get(c).map_or(true, |v| v.is_empty())) {
+            return None;
+        }
         // meet_func_req: HashMap<&str, HashMap<&str, Vec<Arc<GroundedFunc>>>>
         let mut meet_func_req = rep.by_relationship(funcs_list);
-        let mut i0: HashMap<&str, usize> = HashMap::new();
+        if funcs_list.iter().any(|f| {
+                                     meet_func_req
+                                         .get(f.get_name())
+                                         .map_or(true, |m| m.is_empty())
+                                 }) {
+            return None;
+        }
+        // inverted index from object name to the memberships it meets,
+        // the amount of memberships doubles as the count of classes met
+        let mut i0: HashMap<&str, Vec<&Arc<GroundedMemb>>> = HashMap::new();
         for v in meet_cls_req.values() {
-            for name in v.iter()
-                    .map(|x| unsafe {
-                             let t = &*(&**x as *const GroundedMemb);
-                             t.get_name()
-                         }) {
-                let cnt: &mut usize = i0.entry(name).or_insert(0);
-                *cnt += 1;
+            for memb in v {
+                let name = unsafe { &*(&**memb as *const GroundedMemb) }.get_name();
+                i0.entry(name).or_insert(vec![]).push(memb);
             }
         }
         let mut i1: HashMap<&str, usize> = HashMap::new();
@@ -928,16 +927,15 @@ pub(crate) fn meet_sent_req<'a>(rep: &'a Representation,
         }
         let i2: Vec<_>;
         let cls_filter = i0.iter()
-            .filter(|&(_, cnt)| *cnt == class_list.len())
+            .filter(|&(_, membs)| membs.len() == class_list.len())
             .map(|(k, _)| *k);
         let func_filter = i1.iter()
             .filter(|&(_, cnt)| *cnt == funcs_list.len())
             .map(|(k, _)| *k);
         if !meet_func_req.is_empty() && !meet_cls_req.is_empty() {
-            let c1: HashSet<&str> = cls_filter.collect();
+            // probe the class index directly instead of collecting the class matches
             i2 = func_filter
-                .filter_map(|n0| c1.get(&n0))
-                .cloned()
+                .filter(|n0| i0.get(n0).map_or(false, |membs| membs.len() == class_list.len()))
                 .collect();
         } else if !meet_func_req.is_empty() {
             i2 = func_filter.collect();
@@ -947,33 +945,21 @@ pub(crate) fn meet_sent_req<'a>(rep: &'a Representation,
         for name in i2 {
             let mut gr_memb: HashMap<&str, Arc<GroundedMemb>> = HashMap::new();
             let mut gr_relations: HashMap<&str, Vec<Arc<GroundedFunc>>> = HashMap::new();
-            for ls in meet_cls_req.values() {
-                for e in ls {
-                    if e.get_name() == name {
-                        let t = unsafe { &*(&**e as *const GroundedMemb) };
-                        gr_memb.insert(t.get_parent(), e.clone());
-                    }
+            if let Some(membs) = i0.get(name) {
+                for e in membs {
+                    let t = unsafe { &*(&***e as *const GroundedMemb) };
+                    gr_memb.insert(t.get_parent(), (*e).clone());
                 }
             }
             for (k, map) in &mut meet_func_req {
                 let ls = map.remove(name).unwrap();
                 gr_relations.insert(k, ls);
             }
-            if results.contains_key(var) {
-                let v = results.get_mut(var).unwrap();
-                v.push(Arc::new(VarAssignment {
-                                    name: name,
-                                    classes: gr_memb,
-                                    funcs: gr_relations,
-                                }))
-            } else {
-                results.insert(var,
-                               vec![Arc::new(VarAssignment {
-                                                 name: name.clone(),
-                                                 classes: gr_memb,
-                                                 funcs: gr_relations,
-                                             })]);
-            }
+            results.entry(var).or_insert_with(Vec::new).push(Arc::new(VarAssignment {
+                name: name,
+                classes: gr_memb,
+                funcs: gr_relations,
+            }));
         }
         if !results.contains_key(var) {
             return None;
@@ -982,37 +968,30 @@ pub(crate) fn meet_sent_req<'a>(rep: &'a Representation,
     Some(results)
 }
 
+/// Lazily iterates the cartesian product of the assignments for each variable.
+///
+/// Only the current combination of indexes is kept, the product is never
+/// materialized nor are the already yielded combinations recorded.
 #[derive(Debug)]
 pub(crate) struct ArgsProduct<'a> {
-    indexes: HashMap<&'a Var, (usize, bool)>,
-    input: HashMap<&'a Var, Vec<Arc<VarAssignment<'a>>>>,
-    curr: &'a Var,
-    done: HashSet<Vec<(*const Var, &'a str)>>,
+    input: Vec<(&'a Var, Vec<Arc<VarAssignment<'a>>>)>,
+    indexes: Vec<usize>,
+    exhausted: bool,
 }
 
 impl<'a> ArgsProduct<'a> {
     pub fn product(input: HashMap<&'a Var, Vec<Arc<VarAssignment<'a>>>>)
                    -> Option<ArgsProduct<'a>> {
-        let mut indexes = HashMap::new();
-        let mut curr = None;
-        let mut first = true;
-        for k in input.keys() {
-            if first {
-                curr = Some(*k);
-                first = false;
-            }
-            indexes.insert(*k, (0_usize, false));
-        }
-        if curr.is_some() {
-            Some(ArgsProduct {
-                     indexes: indexes,
-                     input: input,
-                     curr: curr.unwrap(),
-                     done: HashSet::new(),
-                 })
-        } else {
-            None
+        if input.is_empty() || input.values().any(|x| x.is_empty()) {
+            return None;
         }
+        let input = Vec::from_iter(input.into_iter());
+        let indexes = vec![0_usize; input.len()];
+        Some(ArgsProduct {
+                 input: input,
+                 indexes: indexes,
+                 exhausted: false,
+             })
     }
 }
 
@@ -1020,75 +999,25 @@ impl<'a> ::std::iter::Iterator for ArgsProduct<'a> {
     type Item = Vec<(&'a Var, Arc<VarAssignment<'a>>)>;
 
     fn next(&mut self) -> Option<Vec<(&'a Var, Arc<VarAssignment<'a>>)>> {
-        loop {
-            let mut row_0 = vec![];
-            let mut val = vec![];
-            for (k1, v1) in &self.input {
-                let idx_1 = self.indexes[k1];
-                let assign = v1[idx_1.0].clone();
-                val.push((*k1 as *const Var, assign.name));
-                row_0.push((*k1, assign));
-            }
-            if self.completed_iter() {
-                return None;
-            } else if !self.done.contains(&val) {
-                self.done.insert(val);
-                return Some(row_0);
-            }
+        if self.exhausted {
+            return None;
         }
-    }
-}
-
-impl<'a> ArgsProduct<'a> {
-    fn completed_iter(&mut self) -> bool {
-        let mut max = 0;
-        for v in self.indexes.values() {
-            if v.1 {
-                max += 1;
+        let row = self.input
+            .iter()
+            .zip(&self.indexes)
+            .map(|(&(var, ref assignments), idx)| (var, assignments[*idx].clone()))
+            .collect();
+        // advance the indexes, the first variable is the one which changes faster
+        self.exhausted = true;
+        for (idx, &(_, ref assignments)) in self.indexes.iter_mut().zip(&self.input) {
+            *idx += 1;
+            if *idx < assignments.len() {
+                self.exhausted = false;
+                break;
             }
+            *idx = 0;
         }
-        if max == self.indexes.len() {
-            true
-        } else {
-            let p;
-            {
-                let l = self.input[&self.curr].len();
-                let curr = self.indexes[&self.curr];
-                if curr.0 < l - 1 {
-                    p = true;
-                } else {
-                    p = false;
-                }
-            }
-            if p {
-                let mut i = 0;
-                for (j, (k, v)) in self.indexes.iter_mut().enumerate() {
-                    i = j;
-                    let l = self.input[k].len();
-                    if (*k != self.curr) && (v.0 < l - 1) {
-                        v.0 += 1;
-                        break;
-                    }
-                }
-                let lidx = self.indexes.len() - 1;
-                let mut curr = self.indexes.get_mut(&self.curr).unwrap();
-                let l = self.input[&self.curr].len();
-                if (i == lidx) && (curr.0 < l) {
-                    curr.0 += 1;
-                }
-            } else {
-                for (k, v) in &self.indexes {
-                    if *k != self.curr && !v.1 {
-                        self.curr = k;
-                        break;
-                    }
-                }
-                let mut curr = self.indexes.get_mut(&self.curr).unwrap();
-                curr.1 = true;
-                curr.0 = 0;
-            }
-            false
-        }
+        Some(row)
     }
 }
 
@@ -1096,13 +1025,20 @@ impl<'a> ArgsProduct<'a> {
 struct ProofNode<'a> {
     proof: Arc<LogSentence>,
     antecedents: Vec<&'a str>,
+    var_reqs: Vec<HashMap<&'a Var, Vec<&'a Assert>>>,
 }
 
 impl<'a> ProofNode<'a> {
-    fn new(proof: Arc<LogSentence>, antecedents: Vec<&str>) -> ProofNode {
+    fn new(proof: Arc<LogSentence>, antecedents: Vec<&'a str>) -> ProofNode<'a> {
+        // the variable requeriments of the proof don't change, so they are computed
+        // once per node instead of on each unification pass;
+        // the sentence is kept alive by the node itself
+        let sent = unsafe { &*(&*proof as *const LogSentence) as &'a LogSentence };
+        let var_reqs = sent.get_lhs_predicates().into_sent_req().collect();
         ProofNode {
             proof: proof.clone(),
             antecedents: antecedents,
+            var_reqs: var_reqs,
         }
     }
 }
@@ -1132,6 +1068,8 @@ pub(crate) enum QueryInput {
 struct QueryProcessed<'b> {
     cls_queries_free: HashMap<&'b Var, Vec<&'b FreeClsMemb>>,
     cls_queries_grounded: HashMap<&'b str, Vec<Arc<GroundedMemb>>>,
+    // grounded queries without time data, shared between identical query terms
+    cls_queries_untimed: Vec<Arc<GroundedMemb>>,
     cls_memb_query: HashMap<&'b Var, Vec<&'b FreeClsOwner>>,
     func_queries_free: HashMap<&'b Var, Vec<&'b FuncDecl>>,
     func_queries_grounded: Vec<Arc<GroundedFunc>>,
@@ -1148,6 +1086,7 @@ impl<'b> QueryProcessed<'b> {
         QueryProcessed {
             cls_queries_free: HashMap::new(),
             cls_queries_grounded: HashMap::new(),
+            cls_queries_untimed: vec![],
             cls_memb_query: HashMap::new(),
             func_queries_free: HashMap::new(),
             func_queries_grounded: vec![],
@@ -1171,8 +1110,11 @@ impl<'b> QueryProcessed<'b> {
                             Predicate::GroundedMemb(ref t) => {
                                 if let Some(times) = cdecl.get_time_payload(t.get_value()) {
                                     t.overwrite_time_data(&times);
+                                    query.push_to_clsquery_grounded(t.get_name(),
+                                                                    Arc::new(t.clone()));
+                                } else if let Some(shared) = query.share_untimed_clsquery(t) {
+                                    query.push_to_clsquery_grounded(t.get_name(), shared);
                                 }
-                                query.push_to_clsquery_grounded(t.get_name(), Arc::new(t.clone()));
                             }
                             _ => return Err(()), // not happening ever
                         }
@@ -1201,7 +1143,7 @@ impl<'b> QueryProcessed<'b> {
             match *fdecl.get_parent() {
                 Terminal::GroundedTerm(_) => {
                     if fdecl.is_grounded() {
-                        query.push_to_fnquery_grounded(fdecl.clone().into_grounded());
+                        query.push_to_fnquery_grounded(fdecl.to_grounded());
                     } else {
                         for a in fdecl.get_args() {
                             if let Predicate::FreeClsMemb(ref t) = *a {
@@ -1281,6 +1223,17 @@ impl<'b> QueryProcessed<'b> {
             .push(cls);
     }
 
+    /// Returns a shared grounded query for the membership unless an identical
+    /// one was already queued, in which case there is no need to solve it again.
+    fn share_untimed_clsquery(&mut self, cls: &GroundedMemb) -> Option<Arc<GroundedMemb>> {
+        if self.cls_queries_untimed.iter().any(|q| q.is_same(cls)) {
+            return None;
+        }
+        let shared = Arc::new(cls.clone());
+        self.cls_queries_untimed.push(shared.clone());
+        Some(shared)
+    }
+
     #[inline]
     fn push_to_clsquery_free(&mut self, term: &'b Var, cls: &'b FreeClsMemb) {
         self.cls_queries_free
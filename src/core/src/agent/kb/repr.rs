@@ -7,7 +7,6 @@ use float_cmp::ApproxEqUlps;
 
 use std::collections::{HashMap, VecDeque};
 use std::iter::FromIterator;
-use std::rc::Rc;
 use std::sync::{Arc, RwLock};
 
 /// A container for internal agent's representations.
@@ -59,29 +58,36 @@ impl Representation {
         let num_threads = 0; // TODO: pass the number of threads available for inference
         let pres = logic_parser(source.as_str(), true, num_threads);
         if pres.is_ok() {
-            let mut pres: VecDeque<ParseTree> = pres.unwrap();
+            let pres: VecDeque<ParseTree> = pres.unwrap();
             let mut errors = Vec::new();
-            for _ in 0..pres.len() {
-                match pres.pop_front().unwrap() {
+            let no_context: Option<&super::IExprResult> = None;
+            let no_assignments = HashMap::new();
+            let mut relations = Vec::new();
+            for tree in pres {
+                match tree {
                     ParseTree::Assertion(assertions) => {
+                        // process all the memberships in a single pass and the relations
+                        // afterwards, once every class they may refer to is in place
                         for assertion in assertions {
-                            if assertion.is_class() {
-                                let cls_decl = assertion.unwrap_cls();
-                                let f = HashMap::new();
-                                let time_data = cls_decl.get_own_time_data(&f, None);
-                                for a in cls_decl {
-                                    let t = time_data.clone();
-                                    t.replace_last_val(a.get_value());
-                                    a.overwrite_time_data(&t);
-                                    let x: Option<&super::IExprResult> = None;
-                                    self.up_membership(Arc::new(a), x)
+                            match assertion {
+                                Assert::ClassDecl(cls_decl) => {
+                                    let time_data =
+                                        cls_decl.get_own_time_data(&no_assignments, None);
+                                    for a in cls_decl {
+                                        // copy straight into the member records instead of
+                                        // going through an intermediate clone of the time data
+                                        a.overwrite_time_data(&time_data);
+                                        self.up_membership(Arc::new(a), no_context)
+                                    }
+                                }
+                                Assert::FuncDecl(func_decl) => {
+                                    relations.push(Arc::new(func_decl.into_grounded()));
                                 }
-                            } else {
-                                let a = Arc::new(assertion.unwrap_fn().into_grounded());
-                                let x: Option<&super::IExprResult> = None;
-                                self.up_relation(a, x)
                             }
                         }
+                        for a in relations.drain(..) {
+                            self.up_relation(a, no_context)
+                        }
                     }
                     ParseTree::IExpr(iexpr) => self.add_belief(Arc::new(iexpr)),
                     ParseTree::Expr(rule) => self.add_rule(Arc::new(rule)),
@@ -139,58 +145,19 @@ impl Representation {
     pub fn up_membership<T: ProofResContext>(&self,
                                                     assert: Arc<GroundedMemb>,
                                                     context: Option<&T>) {
-        let parent_exists = self.classes
-            .read()
-            .unwrap()
-            .contains_key(assert.get_parent());
-        if !parent_exists {
-            let class = Class::new(assert.get_parent().to_string(), ClassKind::Membership);
-            self.classes
-                .write()
-                .unwrap()
-                .insert(class.name.clone(), class);
-        }
+        self.with_class(assert.get_parent(), ClassKind::Membership, |_| ());
         let decl;
         let is_new: bool;
         if (assert.get_name()).starts_with('$') {
-            let entity_exists = self.entities
-                .read()
-                .unwrap()
-                .contains_key(assert.get_name());
-            if entity_exists {
-                let lock = self.entities.read().unwrap();
-                let entity = lock.get(assert.get_name()).unwrap();
-                is_new = entity.add_class_membership(self, assert.clone(), context);
-                decl = ClassMember::Entity(assert.clone());
-            } else {
-                let entity = Entity::new(assert.get_name().to_string());
-                self.entities
-                    .write()
-                    .unwrap()
-                    .insert(entity.name.clone(), entity);
-                let lock = self.entities.read().unwrap();
-                let entity = lock.get(assert.get_name()).unwrap();
-                is_new = entity.add_class_membership(self, assert.clone(), context);
-                decl = ClassMember::Entity(assert.clone());
-            }
+            is_new = self.with_entity(assert.get_name(), |entity| {
+                entity.add_class_membership(self, assert.clone(), context)
+            });
+            decl = ClassMember::Entity(assert.clone());
         } else {
-            let class_exists = self.classes.read().unwrap().contains_key(assert.get_name());
-            if class_exists {
-                let lock = self.classes.read().unwrap();
-                let class = lock.get(assert.get_name()).unwrap();
-                is_new = class.add_class_membership(self, assert.clone(), context);
-                decl = ClassMember::Class(assert.clone());
-            } else {
-                let class = Class::new(assert.get_name().to_string(), ClassKind::Membership);
-                self.classes
-                    .write()
-                    .unwrap()
-                    .insert(class.name.clone(), class);
-                let lock = self.classes.read().unwrap();
-                let class = lock.get(assert.get_name()).unwrap();
-                is_new = class.add_class_membership(self, assert.clone(), context);
-                decl = ClassMember::Class(assert.clone());
-            }
+            is_new = self.with_class(assert.get_name(), ClassKind::Membership, |class| {
+                class.add_class_membership(self, assert.clone(), context)
+            });
+            decl = ClassMember::Class(assert.clone());
         }
         if is_new {
             let lock = self.classes.read().unwrap();
@@ -203,64 +170,64 @@ impl Representation {
                                                   assert: Arc<GroundedFunc>,
                                                   context: Option<&T>) {
         // it doesn't matter this is overwritten, as if it exists, it exists for all
-        let is_new = Rc::new(::std::cell::RefCell::new(true));
-        let process_arg = |a: &GroundedMemb| {
-            let subject = a.get_name();
-            let is_new1;
-            if (subject).starts_with('$') {
-                let entity_exists = self.entities.read().unwrap().contains_key(subject);
-                if entity_exists {
-                    let lock = self.entities.read().unwrap();
-                    let entity = lock.get(subject).unwrap();
-                    is_new1 = entity.add_relationship(self, assert.clone(), context);
-                } else {
-                    let entity = Entity::new(subject.to_string());
-                    self.entities
-                        .write()
-                        .unwrap()
-                        .insert(entity.name.clone(), entity);
-                    let lock = self.entities.read().unwrap();
-                    let entity = lock.get(subject).unwrap();
-                    is_new1 = entity.add_relationship(self, assert.clone(), context);
-                }
-            } else {
-                let class_exists = self.classes.read().unwrap().contains_key(subject);
-                if class_exists {
-                    let lock = self.classes.read().unwrap();
-                    let class = lock.get(subject).unwrap();
-                    is_new1 = class.add_relationship(self, assert.clone(), context);
-                } else {
-                    let class = Class::new(subject.to_string(), ClassKind::Membership);
-                    self.classes
-                        .write()
-                        .unwrap()
-                        .insert(class.name.clone(), class);
-                    let lock = self.classes.read().unwrap();
-                    let class = lock.get(subject).unwrap();
-                    is_new1 = class.add_relationship(self, assert.clone(), context);
-                }
-            }
-            let new_check = is_new.clone();
-            *new_check.borrow_mut() = is_new1;
-        };
-        let relation_exists = self.classes.read().unwrap().contains_key(assert.get_name());
-        if !relation_exists {
-            let relationship = Class::new(assert.get_name().to_string(), ClassKind::Relationship);
-            self.classes
-                .write()
-                .unwrap()
-                .insert(relationship.name.clone(), relationship);
-        }
+        let mut is_new = true;
+        self.with_class(assert.get_name(), ClassKind::Relationship, |_| ());
         for arg in assert.get_args() {
-            process_arg(arg);
+            let subject = arg.get_name();
+            is_new = if (subject).starts_with('$') {
+                self.with_entity(subject, |entity| {
+                    entity.add_relationship(self, assert.clone(), context)
+                })
+            } else {
+                self.with_class(subject, ClassKind::Membership, |class| {
+                    class.add_relationship(self, assert.clone(), context)
+                })
+            };
         }
-        if *is_new.borrow() {
+        if is_new {
             let lock = self.classes.read().unwrap();
             let parent = lock.get(assert.get_name()).unwrap();
             parent.add_relation_to_class(assert.clone());
         }
     }
 
+    /// Applies `f` to the entity with the given name, creating it first if it
+    /// does not exist yet. On the common path (the entity exists) this costs
+    /// a single lookup under the read lock.
+    fn with_entity<R, F: FnOnce(&Entity) -> R>(&self, name: &str, f: F) -> R {
+        {
+            let lock = self.entities.read().unwrap();
+            if let Some(entity) = lock.get(name) {
+                return f(entity);
+            }
+        }
+        {
+            let entity = Entity::new(name.to_string());
+            let mut lock = self.entities.write().unwrap();
+            lock.entry(entity.name.clone()).or_insert(entity);
+        }
+        let lock = self.entities.read().unwrap();
+        f(lock.get(name).unwrap())
+    }
+
+    /// Applies `f` to the class with the given name, creating it first (of the
+    /// given kind) if it does not exist yet.
+    fn with_class<R, F: FnOnce(&Class) -> R>(&self, name: &str, kind: ClassKind, f: F) -> R {
+        {
+            let lock = self.classes.read().unwrap();
+            if let Some(class) = lock.get(name) {
+                return f(class);
+            }
+        }
+        {
+            let class = Class::new(name.to_string(), kind);
+            let mut lock = self.classes.write().unwrap();
+            lock.entry(class.name.clone()).or_insert(class);
+        }
+        let lock = self.classes.read().unwrap();
+        f(lock.get(name).unwrap())
+    }
+
     fn add_belief(&self, belief: Arc<LogSentence>) {
         fn update(subject: &str,
                   name: &str,
@@ -403,11 +370,11 @@ impl Representation {
             }
         };
 
+        let rhs_preds = belief.get_rhs_predicates();
         for var_req in belief.get_lhs_predicates().into_sent_req() {
             if let Some(candidates) = meet_sent_req(self, &var_req) {
                 for var in candidates.keys() {
-                    let it = belief.get_rhs_predicates();
-                    for pred in it.iter().filter(|x| x.contains(&**var)) {
+                    for pred in rhs_preds.iter().filter(|x| x.contains(&**var)) {
                         match **pred {
                             Assert::ClassDecl(ref cls_decl) => {
                                 iter_cls_candidates(cls_decl, &candidates)
@@ -533,28 +500,30 @@ impl Representation {
         }
     }
 
-    pub fn class_membership(&self, pred: &GroundedMemb) -> Option<bool> {
-        let subject = pred.get_name();
+    /// Checks if the subject is a member of each of the given classes, the subject
+    /// is looked up only once. Results are in the same order as `preds`: `None` if the
+    /// membership is not known, otherwise whether it satisfies the predicate.
+    pub fn class_memberships(&self,
+                             subject: &str,
+                             preds: &[Arc<GroundedMemb>])
+                             -> Vec<Option<bool>> {
+        fn cmp_memb(current: Option<Arc<GroundedMemb>>, pred: &GroundedMemb) -> Option<bool> {
+            current.map(|current| *current == *pred)
+        }
         if subject.starts_with('$') {
             if let Some(entity) = self.entities.read().unwrap().get(subject) {
-                if let Some(current) = entity.belongs_to_class(pred.get_parent()) {
-                    if *current == *pred {
-                        return Some(true);
-                    } else {
-                        return Some(false);
-                    }
-                }
+                return preds
+                           .iter()
+                           .map(|p| cmp_memb(entity.belongs_to_class(p.get_parent()), p))
+                           .collect();
             }
         } else if let Some(class) = self.classes.read().unwrap().get(subject) {
-            if let Some(current) = class.belongs_to_class(pred.get_parent()) {
-                if *current == *pred {
-                    return Some(true);
-                } else {
-                    return Some(false);
-                }
-            }
+            return preds
+                       .iter()
+                       .map(|p| cmp_memb(class.belongs_to_class(p.get_parent()), p))
+                       .collect();
         }
-        None
+        vec![None; preds.len()]
     }
 
     pub fn get_class_membership(&self, subject: &FreeClsOwner) -> Vec<Arc<GroundedMemb>> {
@@ -963,20 +932,20 @@ enum ClassMember {
 
 impl ClassMember {
     #[inline]
-    fn unwrap_memb(&self) -> Arc<GroundedMemb> {
+    fn as_memb(&self) -> Option<&Arc<GroundedMemb>> {
         match *self {
             ClassMember::Entity(ref obj) |
-            ClassMember::Class(ref obj) => obj.clone(),
-            ClassMember::Func(_) => panic!(),
+            ClassMember::Class(ref obj) => Some(obj),
+            ClassMember::Func(_) => None,
         }
     }
 
     #[inline]
-    fn unwrap_fn(&self) -> Arc<GroundedFunc> {
+    fn as_fn(&self) -> Option<&Arc<GroundedFunc>> {
         match *self {
-            ClassMember::Func(ref f) => f.clone(),
+            ClassMember::Func(ref f) => Some(f),
             ClassMember::Entity(_) |
-            ClassMember::Class(_) => panic!(),
+            ClassMember::Class(_) => None,
         }
     }
 }
@@ -1083,8 +1052,9 @@ impl Class {
     pub fn get_members(&self, comp: &FreeClsMemb) -> Vec<Arc<GroundedMemb>> {
         let lock = self.members.read().unwrap();
         lock.iter()
-            .map(|x| x.unwrap_memb())
+            .filter_map(|x| x.as_memb())
             .filter(|m| comp.grounded_eq(m))
+            .cloned()
             .collect::<Vec<_>>()
     }
 
@@ -1157,8 +1127,7 @@ impl Class {
     pub fn get_funcs(&self, func: &FuncDecl) -> Vec<Arc<GroundedFunc>> {
         let mut res = vec![];
         let lock = self.members.read().unwrap();
-        for curr_func in lock.iter() {
-            let curr_func = curr_func.unwrap_fn();
+        for curr_func in lock.iter().filter_map(|x| x.as_fn()) {
             let mut process = true;
             for (i, arg) in func.get_args().enumerate() {
                 if !arg.is_var() && (arg.get_name() != curr_func.get_args_names()[i]) {
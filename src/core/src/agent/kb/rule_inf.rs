@@ -57,19 +57,21 @@ pub(crate) fn rules_inference_rollback(agent: &Representation, rule: Arc<LogSent
     let mut gr_funcs: Vec<Arc<GroundedFunc>> = Vec::new();
     let preds = rule.get_all_predicates();
     for p in preds {
-        if p.is_class() {
-            let cls_name = p.get_name();
-            for decl in p.unwrap_cls_as_ref().get_args() {
-                let obj_name = decl.get_name();
-                if let Some(decl) = agent.get_obj_from_class(cls_name, obj_name) {
-                    gr_classes.push(decl);
+        match *p {
+            Assert::ClassDecl(ref cls_decl) => {
+                let cls_name = cls_decl.get_name();
+                for decl in cls_decl.get_args() {
+                    let obj_name = decl.get_name();
+                    if let Some(decl) = agent.get_obj_from_class(cls_name, obj_name) {
+                        gr_classes.push(decl);
+                    }
                 }
             }
-        } else {
-            let func = p.unwrap_fn_as_ref();
-            let cmp = func.clone().into_grounded();
-            if let Some(grfunc) = agent.get_relationship(&cmp, cmp.get_arg_name(1)) {
-                gr_funcs.push(grfunc);
+            Assert::FuncDecl(ref func) => {
+                let cmp = func.to_grounded();
+                if let Some(grfunc) = agent.get_relationship(&cmp, cmp.get_arg_name(1)) {
+                    gr_funcs.push(grfunc);
+                }
             }
         }
     }
@@ -10,11 +10,10 @@ use lang::errors::ParseErrF;
 use lang::logsent::*;
 use lang::parser::*;
 
-use chrono::{Duration, UTC};
+use chrono::{Duration, Timelike, UTC};
 use float_cmp::ApproxEqUlps;
 
 use std::collections::HashMap;
-use std::iter::FromIterator;
 use std::str;
 use std::sync::{RwLock, Arc, Weak};
 use std::sync::atomic::AtomicBool;
@@ -119,11 +118,11 @@ impl<'a> Predicate {
     }
 
     #[inline]
-    fn generate_uid(&self) -> Vec<u8> {
+    fn generate_uid(&self, id: &mut Vec<u8>) {
         match *self {
-            Predicate::FreeClsMemb(ref t) => t.generate_uid(),
-            Predicate::GroundedMemb(ref t) => t.generate_uid(),
-            Predicate::FreeClsOwner(ref t) => t.generate_uid(),
+            Predicate::FreeClsMemb(ref t) => t.generate_uid(id),
+            Predicate::GroundedMemb(ref t) => t.generate_uid(id),
+            Predicate::FreeClsOwner(ref t) => t.generate_uid(id),
         }
     }
 
@@ -252,18 +251,15 @@ impl GroundedMemb {
         })
     }
 
-    fn generate_uid(&self) -> Vec<u8> {
-        let mut id: Vec<u8> = vec![];
-        id.append(&mut Vec::from(self.term.as_bytes()));
+    fn generate_uid(&self, id: &mut Vec<u8>) {
+        id.extend_from_slice(self.term.as_bytes());
         if let Some(ref cmp) = self.operator {
-            cmp.generate_uid(&mut id);
+            cmp.generate_uid(id);
         }
         if let Some(val) = *self.value.read().unwrap() {
-            let mut id_2 = format!("{}", val).into_bytes();
-            id.append(&mut id_2);
+            id.extend_from_slice(format!("{}", val).as_bytes());
         }
-        id.append(&mut Vec::from(self.parent.as_bytes()));
-        id
+        id.extend_from_slice(self.parent.as_bytes());
     }
 
     #[inline]
@@ -296,13 +292,15 @@ impl GroundedMemb {
             *value_lock = new_val;
         }
         if let Some(ref bms) = self.bms {
-            if data.bms.is_some() {
-                let data_bms = data.bms.as_ref().unwrap();
-                bms.update(GroundedRef::Class(self), agent, data_bms, was_produced)
-            } else {
-                let data_bms = BmsWrapper::new(false);
-                data_bms.new_record(None, new_val, None);
-                bms.update(GroundedRef::Class(self), agent, &data_bms, was_produced)
+            match data.bms {
+                Some(ref data_bms) => {
+                    bms.update(GroundedRef::Class(self), agent, data_bms, was_produced)
+                }
+                None => {
+                    let data_bms = BmsWrapper::new(false);
+                    data_bms.new_record(None, new_val, None);
+                    bms.update(GroundedRef::Class(self), agent, &data_bms, was_produced)
+                }
             }
         }
     }
@@ -312,20 +310,13 @@ impl GroundedMemb {
     }
 
     pub fn from_free(free: &FreeClsMemb, assignment: &str) -> GroundedMemb {
-        let bms;
-        let val = if free.value.is_some() {
-            let t_bms = BmsWrapper::new(false);
-            t_bms.new_record(None, free.value, None);
-            bms = Some(Arc::new(t_bms));
-            Some(free.value.unwrap())
-        } else {
-            bms = None;
-            None
-        };
-        let op = if free.value.is_some() {
-            Some(free.operator.unwrap())
-        } else {
-            None
+        let (val, op, bms) = match free.value {
+            Some(val) => {
+                let t_bms = BmsWrapper::new(false);
+                t_bms.new_record(None, Some(val), None);
+                (Some(val), free.operator, Some(Arc::new(t_bms)))
+            }
+            None => (None, None, None),
         };
         GroundedMemb {
             term: assignment.to_string(),
@@ -353,13 +344,21 @@ impl GroundedMemb {
         true
     }
 
+    /// Structural identity: same subject, class, operator and value. Unlike `==`
+    /// this does not test whether one of the memberships satisfies the other.
+    #[inline]
+    pub fn is_same(&self, other: &GroundedMemb) -> bool {
+        self.comparable(other) && self.operator == other.operator &&
+        self.get_value() == other.get_value()
+    }
+
+    /// Copies the time records from `data`, the last one takes the value of this membership.
     pub fn overwrite_time_data(&self, data: &BmsWrapper) {
-        self.bms.as_ref().unwrap().overwrite_data(data);
+        self.bms.as_ref().unwrap().overwrite_data_with_val(data, self.get_value());
     }
 }
 
 impl ::std::cmp::PartialEq for GroundedMemb {
-    #[allow(collapsible_if)]
     fn eq(&self, other: &GroundedMemb) -> bool {
         if self.term != other.term || self.parent != other.parent {
             return false;
@@ -374,36 +373,23 @@ impl ::std::cmp::PartialEq for GroundedMemb {
         }
         let val_lhs: &Option<f32> = &*self.value.read().unwrap();
         let val_rhs: &Option<f32> = &*other.value.read().unwrap();
-        if (val_lhs.is_none() && val_rhs.is_some()) || (val_lhs.is_some() && val_rhs.is_none()) {
+        if val_lhs.is_some() != val_rhs.is_some() {
             return false;
         }
         match op_lhs {
             CompOperator::Equal => {
-                if op_rhs.is_equal() {
-                    if let Some(ref val_lhs) = *val_lhs {
-                        let val_rhs = val_rhs.as_ref().unwrap();
-                        val_lhs.approx_eq_ulps(val_rhs, FLOAT_EQ_ULPS)
-                    } else {
-                        true
-                    }
-                } else if op_rhs.is_more() {
-                    val_lhs > val_rhs
-                } else if op_rhs.is_less() {
-                    val_lhs < val_rhs
-                } else if op_rhs.is_more_eq() {
-                    if let Some(ref val_lhs) = *val_lhs {
-                        let val_rhs = val_rhs.as_ref().unwrap();
-                        val_lhs.approx_eq_ulps(val_rhs, FLOAT_EQ_ULPS) || val_lhs > val_rhs
-                    } else {
-                        true
-                    }
-                } else {
-                    if let Some(ref val_lhs) = *val_lhs {
-                        let val_rhs = val_rhs.as_ref().unwrap();
-                        val_lhs.approx_eq_ulps(val_rhs, FLOAT_EQ_ULPS) || val_lhs < val_rhs
-                    } else {
-                        true
+                let approx_eq_or = |or: bool| match *val_lhs {
+                    Some(ref val_lhs) => {
+                        val_lhs.approx_eq_ulps(val_rhs.as_ref().unwrap(), FLOAT_EQ_ULPS) || or
                     }
+                    None => true,
+                };
+                match op_rhs {
+                    CompOperator::Equal => approx_eq_or(false),
+                    CompOperator::More => val_lhs > val_rhs,
+                    CompOperator::Less => val_lhs < val_rhs,
+                    CompOperator::MoreEqual => approx_eq_or(val_lhs > val_rhs),
+                    CompOperator::LessEqual => approx_eq_or(val_lhs < val_rhs),
                 }
             }
             CompOperator::More => val_lhs < val_rhs,
@@ -460,40 +446,29 @@ impl GroundedFunc {
         } else {
             return Err(());
         };
-        let mut first = None;
-        let mut second = None;
-        let mut third = None;
-        let mut value = None;
-        for (i, a) in free.args.as_ref().unwrap().iter().enumerate() {
-            let n_a = match *a {
-                Predicate::FreeClsMemb(ref free) => {
-                    let assigned = if let Some(ref assignments) = *assignments {
-                        assignments
-                    } else {
-                        return Err(());
-                    };
-                    if let Some(entity) = assigned.get(&*free.term) {
-                        GroundedMemb::from_free(free, entity.name)
-                    } else {
-                        return Err(());
-                    }
+        let assigned = assignments.as_ref();
+        let ground = |a: &Predicate| match *a {
+            Predicate::FreeClsMemb(ref free) => {
+                match assigned.and_then(|assigned| assigned.get(&*free.term)) {
+                    Some(entity) => Ok(GroundedMemb::from_free(free, entity.name)),
+                    None => Err(()),
                 }
-                Predicate::GroundedMemb(ref term) => term.clone(),
-                _ => return Err(()),
-            };
-            if i == 0 {
-                value = n_a.get_value();
-                first = Some(n_a)
-            } else if i == 1 {
-                second = Some(n_a)
-            } else {
-                third = Some(n_a)
             }
-        }
+            Predicate::GroundedMemb(ref term) => Ok(term.clone()),
+            _ => Err(()),
+        };
+        let mut args = free.args.as_ref().unwrap().iter();
+        let first = ground(args.next().unwrap())?;
+        let second = ground(args.next().unwrap())?;
+        let third = match args.next() {
+            Some(a) => Some(ground(a)?),
+            None => None,
+        };
+        let value = first.get_value();
         let time_data = free.get_own_time_data(time_assign, value);
         Ok(GroundedFunc {
             name: name,
-            args: [first.unwrap(), second.unwrap()],
+            args: [first, second],
             third: third,
             bms: Arc::new(time_data),
         })
@@ -625,19 +600,15 @@ impl FreeClsMemb {
         })
     }
 
-    fn generate_uid(&self) -> Vec<u8> {
-        let mut id: Vec<u8> = vec![];
-        let mut var = format!("{:?}", &*self.term as *const Var).into_bytes();
-        id.append(&mut var);
+    fn generate_uid(&self, id: &mut Vec<u8>) {
+        id.extend_from_slice(format!("{:?}", &*self.term as *const Var).as_bytes());
         if let Some(value) = self.value {
-            let mut id_2 = format!("{}", value).into_bytes();
-            id.append(&mut id_2);
+            id.extend_from_slice(format!("{}", value).as_bytes());
         }
         if let Some(ref cmp) = self.operator {
-            cmp.generate_uid(&mut id);
+            cmp.generate_uid(id);
         }
-        id.append(&mut self.parent.generate_uid());
-        id
+        self.parent.generate_uid(id);
     }
 
     #[inline]
@@ -666,19 +637,18 @@ impl FreeClsMemb {
             };
             match other.operator.unwrap() {
                 CompOperator::Equal => {
-                    let self_op = self.operator.as_ref().unwrap();
-                    if self_op.is_equal() {
-                        val_free.approx_eq_ulps(&val_grounded, FLOAT_EQ_ULPS)
-                    } else if self_op.is_more() {
-                        val_grounded > val_free
-                    } else if self_op.is_less() {
-                        val_grounded < val_free
-                    } else if self_op.is_less_eq() {
-                        (val_grounded < val_free) |
-                        val_free.approx_eq_ulps(&val_grounded, FLOAT_EQ_ULPS)
-                    } else {
-                        (val_grounded > val_free) |
-                        val_free.approx_eq_ulps(&val_grounded, FLOAT_EQ_ULPS)
+                    match self.operator.unwrap() {
+                        CompOperator::Equal => val_free.approx_eq_ulps(&val_grounded, FLOAT_EQ_ULPS),
+                        CompOperator::More => val_grounded > val_free,
+                        CompOperator::Less => val_grounded < val_free,
+                        CompOperator::LessEqual => {
+                            (val_grounded < val_free) |
+                            val_free.approx_eq_ulps(&val_grounded, FLOAT_EQ_ULPS)
+                        }
+                        CompOperator::MoreEqual => {
+                            (val_grounded > val_free) |
+                            val_free.approx_eq_ulps(&val_grounded, FLOAT_EQ_ULPS)
+                        }
                     }
                 }
                 CompOperator::Less |
@@ -715,19 +685,15 @@ impl FreeClsOwner {
         })
     }
 
-    fn generate_uid(&self) -> Vec<u8> {
-        let mut id: Vec<u8> = vec![];
-        id.append(&mut Vec::from(self.term.as_bytes()));
+    fn generate_uid(&self, id: &mut Vec<u8>) {
+        id.extend_from_slice(self.term.as_bytes());
         if let Some(ref val) = self.value {
-            let mut id_2 = format!("{}", *val).into_bytes();
-            id.append(&mut id_2);
+            id.extend_from_slice(format!("{}", *val).as_bytes());
         }
         if let Some(ref cmp) = self.operator {
-            cmp.generate_uid(&mut id);
+            cmp.generate_uid(id);
         }
-        let mut var = format!("{:?}", &*self.parent as *const Var).into_bytes();
-        id.append(&mut var);
-        id
+        id.extend_from_slice(format!("{:?}", &*self.parent as *const Var).as_bytes());
     }
 
     #[inline]
@@ -834,14 +800,6 @@ impl Assert {
         }
     }
 
-    #[inline]
-    pub fn is_class(&self) -> bool {
-        match *self {
-            Assert::FuncDecl(_) => false,
-            Assert::ClassDecl(_) => true,
-        }
-    }
-
     #[inline]
     pub fn contains(&self, var: &Var) -> bool {
         match *self {
@@ -866,38 +824,6 @@ impl Assert {
         }
     }
 
-    #[inline]
-    pub fn unwrap_fn(self) -> FuncDecl {
-        match self {
-            Assert::FuncDecl(f) => f,
-            Assert::ClassDecl(_) => panic!(),
-        }
-    }
-
-    #[inline]
-    pub fn unwrap_fn_as_ref(&self) -> &FuncDecl {
-        match *self {
-            Assert::FuncDecl(ref f) => f,
-            Assert::ClassDecl(_) => panic!(),
-        }
-    }
-
-    #[inline]
-    pub fn unwrap_cls(self) -> ClassDecl {
-        match self {
-            Assert::FuncDecl(_) => panic!(),
-            Assert::ClassDecl(c) => c,
-        }
-    }
-
-    #[inline]
-    pub fn unwrap_cls_as_ref(&self) -> &ClassDecl {
-        match *self {
-            Assert::FuncDecl(_) => panic!(),
-            Assert::ClassDecl(ref c) => c,
-        }
-    }
-
     #[inline]
     pub fn grounded_eq<T: ProofResContext>(&self,
                                            agent: &agent::Representation,
@@ -926,10 +852,10 @@ impl Assert {
     }
 
     #[inline]
-    pub fn generate_uid(&self) -> Vec<u8> {
+    pub fn generate_uid(&self, id: &mut Vec<u8>) {
         match *self {
-            Assert::FuncDecl(ref f) => f.generate_uid(),
-            Assert::ClassDecl(ref c) => c.generate_uid(),
+            Assert::FuncDecl(ref f) => f.generate_uid(id),
+            Assert::ClassDecl(ref c) => c.generate_uid(id),
         }
     }
 }
@@ -946,20 +872,13 @@ impl<'a> FuncDecl {
     pub fn from(other: &FuncDeclBorrowed<'a>,
                 context: &mut ParseContext)
                 -> Result<FuncDecl, ParseErrF> {
-        let mut variant = other.variant;
-        let func_name = match Terminal::from(&other.name, context) {
-            Err(ParseErrF::ReservedKW(val)) => {
-                if &val == "time_calc" {
-                    variant = FuncVariants::TimeCalc;
-                    Terminal::Keyword("time_calc")
-                } else {
-                    return Err(ParseErrF::ReservedKW(val));
-                }
-            }
-            Err(err) => return Err(err),
-            Ok(val) => val,
-        };
-        match variant {
+        // time_calc is a reserved keyword, dispatch it before the name is resolved
+        // so no reserved keyword error has to be built and discarded
+        if other.name.0 == &b"time_calc"[..] {
+            return FuncDecl::decl_timecalc_fn(other, context);
+        }
+        let func_name = Terminal::from(&other.name, context)?;
+        match other.variant {
             FuncVariants::TimeCalc => FuncDecl::decl_timecalc_fn(other, context),
             FuncVariants::Relational => FuncDecl::decl_relational_fn(other, context, func_name),
             FuncVariants::NonRelational => {
@@ -975,30 +894,51 @@ impl<'a> FuncDecl {
             Terminal::GroundedTerm(name) => name,
             Terminal::FreeTerm(_) | Terminal::Keyword(_) => panic!(),
         };
-        let mut first = None;
-        let mut second = None;
-        let mut third = None;
-        let mut val = None;
-        let mut args = args.unwrap();
-        for (i, a) in args.drain(..).enumerate() {
-            let n_a = match a {
-                Predicate::GroundedMemb(term) => term,
-                Predicate::FreeClsMemb(_) | Predicate::FreeClsOwner(_) => panic!(),
-            };
-            if i == 0 {
-                val = n_a.get_value();
-                first = Some(n_a);
-            } else if i == 1 {
-                second = Some(n_a);
-            } else {
-                third = Some(n_a);
-            }
+        let args = args.unwrap().into_iter().map(|a| match a {
+            Predicate::GroundedMemb(term) => term,
+            Predicate::FreeClsMemb(_) | Predicate::FreeClsOwner(_) => panic!(),
+        });
+        FuncDecl::grounded_from_args(name, args, &op_args)
+    }
+
+    /// Same as `into_grounded` but only the grounded arguments are copied,
+    /// instead of cloning the whole declaration beforehand.
+    pub fn to_grounded(&self) -> GroundedFunc {
+        let name = match self.name {
+            Terminal::GroundedTerm(ref name) => name.clone(),
+            Terminal::FreeTerm(_) | Terminal::Keyword(_) => panic!(),
+        };
+        let args = self.args.as_ref().unwrap().iter().map(|a| match *a {
+            Predicate::GroundedMemb(ref term) => term.clone(),
+            Predicate::FreeClsMemb(_) | Predicate::FreeClsOwner(_) => panic!(),
+        });
+        FuncDecl::grounded_from_args(name, args, &self.op_args)
+    }
+
+    fn grounded_from_args<I>(name: String,
+                             mut args: I,
+                             op_args: &Option<Vec<OpArg>>)
+                             -> GroundedFunc
+        where I: Iterator<Item = GroundedMemb>
+    {
+        let first = args.next().unwrap();
+        let second = args.next().unwrap();
+        let third = args.next();
+        let val = first.get_value();
+        GroundedFunc {
+            name: name,
+            args: [first, second],
+            third: third,
+            bms: Arc::new(FuncDecl::grounded_time_data(op_args, val)),
         }
+    }
+
+    fn grounded_time_data(op_args: &Option<Vec<OpArg>>, val: Option<f32>) -> BmsWrapper {
         let mut time_data = BmsWrapper::new(false);
         let mut ow = false;
-        if let Some(mut oargs) = op_args {
-            for arg in oargs.drain(..) {
-                match arg {
+        if let Some(ref oargs) = *op_args {
+            for arg in oargs {
+                match *arg {
                     OpArg::TimeDecl(TimeFn::Time(ref time)) => {
                         time_data.new_record(Some(*time), val, None);
                     }
@@ -1016,12 +956,7 @@ impl<'a> FuncDecl {
             time_data.new_record(None, val, None);
         }
         time_data.overwrite = AtomicBool::new(ow);
-        GroundedFunc {
-            name: name,
-            args: [first.unwrap(), second.unwrap()],
-            third: third,
-            bms: Arc::new(time_data),
-        }
+        time_data
     }
 
     pub fn is_grounded(&self) -> bool {
@@ -1124,7 +1059,7 @@ impl<'a> FuncDecl {
                  -> Option<Arc<BmsWrapper>> {
         if self.is_grounded() {
             let sbj = self.args.as_ref().unwrap();
-            let grfunc = self.clone().into_grounded();
+            let grfunc = self.to_grounded();
             if let Some(relation) = agent.get_relationship(&grfunc, sbj[0].get_name()) {
                 return Some(relation.bms.clone());
             } else {
@@ -1151,22 +1086,18 @@ impl<'a> FuncDecl {
         }
     }
 
-    fn generate_uid(&self) -> Vec<u8> {
-        let mut id = vec![];
-        id.append(&mut self.name.generate_uid());
+    fn generate_uid(&self, id: &mut Vec<u8>) {
+        self.name.generate_uid(id);
         if let Some(ref args) = self.args {
             for a in args {
-                let mut id_2 = a.generate_uid();
-                id.append(&mut id_2)
+                a.generate_uid(id);
             }
         }
         if let Some(ref args) = self.op_args {
             for a in args {
-                let mut id_2 = a.generate_uid();
-                id.append(&mut id_2)
+                a.generate_uid(id);
             }
         }
-        id
     }
 
     fn decl_timecalc_fn(other: &FuncDeclBorrowed<'a>,
@@ -1214,17 +1145,7 @@ impl<'a> FuncDecl {
                           context: &mut ParseContext,
                           name: Terminal)
                           -> Result<FuncDecl, ParseErrF> {
-        let op_args = match other.op_args {
-            Some(ref oargs) => {
-                let mut v0 = Vec::with_capacity(oargs.len());
-                for e in oargs {
-                    let a = OpArg::from(e, context)?;
-                    v0.push(a);
-                }
-                Some(v0)
-            }
-            None => None,
-        };
+        let op_args = decl_op_args(&other.op_args, context)?;
         let mut args = Vec::with_capacity(3);
         if let Some(oargs) = other.args.as_ref() {
             if oargs.len() > 3 || oargs.len() < 2 {
@@ -1260,24 +1181,10 @@ impl<'a> FuncDecl {
                              context: &mut ParseContext,
                              name: Terminal)
                              -> Result<FuncDecl, ParseErrF> {
-        let op_args = match other.op_args {
-            Some(ref oargs) => {
-                let mut v0 = Vec::with_capacity(oargs.len());
-                for e in oargs {
-                    let a = match OpArg::from(e, context) {
-                        Err(err) => return Err(err),
-                        Ok(a) => a,
-                    };
-                    v0.push(a);
-                }
-                Some(v0)
-            }
-            None => None,
-        };
         Ok(FuncDecl {
             name: name,
             args: None,
-            op_args: op_args,
+            op_args: decl_op_args(&other.op_args, context)?,
             variant: FuncVariants::NonRelational,
         })
     }
@@ -1342,17 +1249,7 @@ impl<'a> ClassDecl {
                 context: &mut ParseContext)
                 -> Result<ClassDecl, ParseErrF> {
         let class_name = Terminal::from(&other.name, context)?;
-        let op_args = match other.op_args {
-            Some(ref oargs) => {
-                let mut v0 = Vec::with_capacity(oargs.len());
-                for e in oargs {
-                    let a = OpArg::from(e, context)?;
-                    v0.push(a);
-                }
-                Some(v0)
-            }
-            None => None,
-        };
+        let op_args = decl_op_args(&other.op_args, context)?;
         let args = {
             let mut v0 = Vec::with_capacity(other.args.len());
             for arg in &other.args {
@@ -1487,20 +1384,16 @@ impl<'a> ClassDecl {
         None
     }
 
-    fn generate_uid(&self) -> Vec<u8> {
-        let mut id = vec![];
-        id.append(&mut self.name.generate_uid());
+    fn generate_uid(&self, id: &mut Vec<u8>) {
+        self.name.generate_uid(id);
         for a in &self.args {
-            let mut id_2 = a.generate_uid();
-            id.append(&mut id_2)
+            a.generate_uid(id);
         }
         if let Some(ref args) = self.op_args {
             for a in args {
-                let mut id_2 = a.generate_uid();
-                id.append(&mut id_2)
+                a.generate_uid(id);
             }
         }
-        id
     }
 
     fn contains_var(&self, var: &Var) -> bool {
@@ -1574,61 +1467,41 @@ pub(crate) enum OpArg {
 
 impl<'a> OpArg {
     pub fn from(other: &OpArgBorrowed<'a>, context: &mut ParseContext) -> Result<OpArg, ParseErrF> {
-        let t0 = match OpArgTerm::from(&other.term, context) {
-            Err(ParseErrF::ReservedKW(kw)) => {
-                match &*kw {
-                    "time" => {
-                        let targ = OpArg::ignore_kw(other, "time", context)?;
-                        return Ok(targ);
-                    }
-                    "overwrite" => return Ok(OpArg::OverWrite),
-                    _ => return Err(ParseErrF::ReservedKW(kw)),
-                }
+        // keywords are told apart on the borrowed terms, instead of going through
+        // the reserved keyword errors of the conversion
+        let t0 = match other.term {
+            OpArgTermBorrowed::Terminal(slice) if slice == &b"time"[..] => {
+                return OpArg::time_arg(other, context);
+            }
+            OpArgTermBorrowed::Terminal(slice) if slice == &b"overwrite"[..] => {
+                return Ok(OpArg::OverWrite);
             }
-            Err(err) => return Err(err),
-            Ok(arg) => arg,
+            ref term => OpArgTerm::from(term, context)?,
         };
         let comp = match other.comp {
-            Some((op, ref tors)) => {
-                match OpArgTerm::from(tors, context) {
-                    Ok(t) => Some((op, t)),
-                    Err(ParseErrF::ReservedKW(kw)) => {
-                        if &kw == "time" {
-                            if t0.is_var() {
-                                return Ok(OpArg::TimeVarFrom(t0.get_var()));
-                            } else {
-                                return Err(ParseErrF::WrongDef);
-                            }
-                        } else {
-                            return Err(ParseErrF::ReservedKW(kw));
-                        }
-                    }
-                    Err(err) => return Err(err),
+            Some((_, OpArgTermBorrowed::Terminal(slice))) if slice == &b"time"[..] => {
+                if t0.is_var() {
+                    return Ok(OpArg::TimeVarFrom(t0.get_var()));
+                } else {
+                    return Err(ParseErrF::WrongDef);
                 }
             }
+            Some((op, ref tors)) => Some((op, OpArgTerm::from(tors, context)?)),
             None => None,
         };
         Ok(OpArg::Generic(t0, comp))
     }
 
-    fn ignore_kw(other: &OpArgBorrowed<'a>,
-                 kw: &str,
-                 context: &mut ParseContext)
-                 -> Result<OpArg, ParseErrF> {
-        match kw {
-            "time" => {
-                let load = OpArgTerm::time_payload(other.comp.as_ref(), context)?;
-                if load.1.is_var() {
-                    Ok(OpArg::TimeVarAssign(load.1.get_var()))
-                } else {
-                    match load.1 {
-                        OpArgTerm::TimePayload(TimeFn::IsVar) => Ok(OpArg::TimeVar),
-                        OpArgTerm::TimePayload(load) => Ok(OpArg::TimeDecl(load)),
-                        _ => Err(ParseErrF::WrongDef),
-                    }
-                }
+    fn time_arg(other: &OpArgBorrowed<'a>, context: &mut ParseContext) -> Result<OpArg, ParseErrF> {
+        let load = OpArgTerm::time_payload(other.comp.as_ref(), context)?;
+        if load.1.is_var() {
+            Ok(OpArg::TimeVarAssign(load.1.get_var()))
+        } else {
+            match load.1 {
+                OpArgTerm::TimePayload(TimeFn::IsVar) => Ok(OpArg::TimeVar),
+                OpArgTerm::TimePayload(load) => Ok(OpArg::TimeDecl(load)),
+                _ => Err(ParseErrF::WrongDef),
             }
-            val => Err(ParseErrF::ReservedKW(val.to_string())),
         }
     }
 
@@ -1641,22 +1514,22 @@ impl<'a> OpArg {
         }
     }
 
-    fn generate_uid(&self) -> Vec<u8> {
+    fn generate_uid(&self, id: &mut Vec<u8>) {
         match *self {
             OpArg::Generic(ref a0, ref a1) => {
-                let mut id = vec![];
-                id.append(&mut a0.generate_uid());
+                a0.generate_uid(id);
                 if let Some((ref cmp, ref a1)) = *a1 {
-                    cmp.generate_uid(&mut id);
-                    id.append(&mut a1.generate_uid());
+                    cmp.generate_uid(id);
+                    a1.generate_uid(id);
                 }
-                id
             }
-            OpArg::TimeDecl(ref decl) => decl.generate_uid(),
-            OpArg::TimeVar => vec![2],
-            OpArg::TimeVarAssign(ref var) => format!("{:?}", &**var as *const Var).into_bytes(),
-            OpArg::TimeVarFrom(ref var) => format!("{:?}", &**var as *const Var).into_bytes(),
-            OpArg::OverWrite => vec![5],
+            OpArg::TimeDecl(ref decl) => decl.generate_uid(id),
+            OpArg::TimeVar => id.push(2),
+            OpArg::TimeVarAssign(ref var) |
+            OpArg::TimeVarFrom(ref var) => {
+                id.extend_from_slice(format!("{:?}", &**var as *const Var).as_bytes())
+            }
+            OpArg::OverWrite => id.push(5),
         }
     }
 
@@ -1687,27 +1560,17 @@ impl<'a> OpArg {
         let arg0 = assignments.get(&*var0).unwrap().get_last_date();
         let var1 = comp.get_var_ref();
         let arg1 = assignments.get(&*var1).unwrap().get_last_date();
+        // the tolerance window is only built when the strict comparison does not hold
+        let approx_eq = || {
+            let comp_diff = Duration::seconds(TIME_EQ_DIFF);
+            !((arg1 < arg0 - comp_diff) || (arg1 > arg0 + comp_diff))
+        };
         match *op {
-            CompOperator::Equal => {
-                let comp_diff = Duration::seconds(TIME_EQ_DIFF);
-                let lower_bound = arg0 - comp_diff;
-                let upper_bound = arg0 + comp_diff;
-                !((arg1 < lower_bound) || (arg1 > upper_bound))
-            }
+            CompOperator::Equal => approx_eq(),
             CompOperator::More => arg0 > arg1,
             CompOperator::Less => arg0 < arg1,
-            CompOperator::MoreEqual => {
-                let comp_diff = Duration::seconds(TIME_EQ_DIFF);
-                let lower_bound = arg0 - comp_diff;
-                let upper_bound = arg0 + comp_diff;
-                !((arg1 < lower_bound) || (arg1 > upper_bound)) || arg0 > arg1
-            }
-            CompOperator::LessEqual => {
-                let comp_diff = Duration::seconds(TIME_EQ_DIFF);
-                let lower_bound = arg0 - comp_diff;
-                let upper_bound = arg0 + comp_diff;
-                !((arg1 < lower_bound) || (arg1 > upper_bound)) || arg0 < arg1
-            }
+            CompOperator::MoreEqual => arg0 > arg1 || approx_eq(),
+            CompOperator::LessEqual => arg0 < arg1 || approx_eq(),
         }
     }
 }
@@ -1747,14 +1610,23 @@ impl TimeFn {
         bms
     }
 
-    fn generate_uid(&self) -> Vec<u8> {
-        let mut id = vec![];
+    fn generate_uid(&self, id: &mut Vec<u8>) {
         match *self {
-            TimeFn::Time(ref time) => id.append(&mut format!("{}", time).into_bytes()), 
+            TimeFn::Time(ref time) => {
+                // encode the integral timestamp instead of formatting the date
+                let secs = time.timestamp();
+                let nanos = time.nanosecond();
+                id.push(1);
+                for i in 0..8 {
+                    id.push((secs >> (i * 8)) as u8);
+                }
+                for i in 0..4 {
+                    id.push((nanos >> (i * 8)) as u8);
+                }
+            }
             TimeFn::Now => id.push(2),
             TimeFn::IsVar => id.push(3),
         }
-        id
     }
 }
 
@@ -1775,7 +1647,9 @@ impl<'a> OpArgTerm {
                 Ok(OpArgTerm::Terminal(t))
             }
             OpArgTermBorrowed::String(slice) => {
-                Ok(OpArgTerm::String(String::from_utf8_lossy(slice).into_owned()))
+                // the input was already valid utf-8, no need to validate it again
+                let s = unsafe { str::from_utf8_unchecked(slice) };
+                Ok(OpArgTerm::String(s.to_string()))
             }
         }
     }
@@ -1807,11 +1681,11 @@ impl<'a> OpArgTerm {
         }
     }
 
-    fn generate_uid(&self) -> Vec<u8> {
+    fn generate_uid(&self, id: &mut Vec<u8>) {
         match *self {
-            OpArgTerm::Terminal(ref t) => t.generate_uid(),
-            OpArgTerm::String(ref s) => Vec::from_iter(s.as_bytes().iter().cloned()), 
-            OpArgTerm::TimePayload(ref t) => t.generate_uid(),
+            OpArgTerm::Terminal(ref t) => t.generate_uid(id),
+            OpArgTerm::String(ref s) => id.extend_from_slice(s.as_bytes()),
+            OpArgTerm::TimePayload(ref t) => t.generate_uid(id),
         }
     }
 
@@ -1874,10 +1748,11 @@ impl Var {
             }
             None => None,
         };
-        let name = unsafe { String::from(str::from_utf8_unchecked(name)) };
-        if reserved(&name) {
-            return Err(ParseErrF::ReservedKW(name));
+        let name = unsafe { str::from_utf8_unchecked(name) };
+        if reserved(name) {
+            return Err(ParseErrF::ReservedKW(name.to_string()));
         }
+        let name = name.to_string();
         Ok(Var {
             name: name,
             op_arg: op_arg,
@@ -1937,10 +1812,11 @@ impl Skolem {
             }
             None => None,
         };
-        let name = unsafe { String::from(str::from_utf8_unchecked(name)) };
-        if reserved(&name) {
-            return Err(ParseErrF::ReservedKW(name));
+        let name = unsafe { str::from_utf8_unchecked(name) };
+        if reserved(name) {
+            return Err(ParseErrF::ReservedKW(name.to_string()));
         }
+        let name = name.to_string();
         Ok(Skolem {
             name: name,
             op_arg: op_arg,
@@ -1960,36 +1836,30 @@ impl<'a> Terminal {
             context: &mut ParseContext)
             -> Result<Terminal, ParseErrF> {
         let &TerminalBorrowed(slice) = other;
-        let name = unsafe { String::from(str::from_utf8_unchecked(slice)) };
-        if reserved(&name) {
-            return Err(ParseErrF::ReservedKW(name));
-        }
-        for v in &context.vars {
-            if v.name == name {
-                return Ok(Terminal::FreeTerm(v.clone()));
-            }
-        }
-        Ok(Terminal::GroundedTerm(name))
+        Terminal::from_slice(slice, context)
     }
 
     fn from_slice(slice: &[u8], context: &mut ParseContext) -> Result<Terminal, ParseErrF> {
-        let name = unsafe { String::from(str::from_utf8_unchecked(slice)) };
-        if reserved(&name) {
-            return Err(ParseErrF::ReservedKW(name));
+        // check the borrowed name first, only grounded terms need an owned copy
+        let name = unsafe { str::from_utf8_unchecked(slice) };
+        if reserved(name) {
+            return Err(ParseErrF::ReservedKW(name.to_string()));
         }
         for v in &context.vars {
             if v.name == name {
                 return Ok(Terminal::FreeTerm(v.clone()));
             }
         }
-        Ok(Terminal::GroundedTerm(name))
+        Ok(Terminal::GroundedTerm(name.to_string()))
     }
 
-    fn generate_uid(&self) -> Vec<u8> {
+    fn generate_uid(&self, id: &mut Vec<u8>) {
         match *self {
-            Terminal::FreeTerm(ref var) => format!("{:?}", &**var as *const Var).into_bytes(),
-            Terminal::GroundedTerm(ref name) => Vec::from_iter(name.as_bytes().iter().cloned()),
-            Terminal::Keyword(name) => Vec::from_iter(name.as_bytes().iter().cloned()),
+            Terminal::FreeTerm(ref var) => {
+                id.extend_from_slice(format!("{:?}", &**var as *const Var).as_bytes())
+            }
+            Terminal::GroundedTerm(ref name) => id.extend_from_slice(name.as_bytes()),
+            Terminal::Keyword(name) => id.extend_from_slice(name.as_bytes()),
         }
     }
 
@@ -2035,6 +1905,22 @@ impl<'a> Terminal {
     }
 }
 
+/// Converts the borrowed operational arguments shared by function and class declarations.
+fn decl_op_args<'a>(op_args: &Option<Vec<OpArgBorrowed<'a>>>,
+                    context: &mut ParseContext)
+                    -> Result<Option<Vec<OpArg>>, ParseErrF> {
+    match *op_args {
+        Some(ref oargs) => {
+            let mut v0 = Vec::with_capacity(oargs.len());
+            for e in oargs {
+                v0.push(OpArg::from(e, context)?);
+            }
+            Ok(Some(v0))
+        }
+        None => Ok(None),
+    }
+}
+
 fn reserved(s: &str) -> bool {
     match s {
         "let" | "time_calc" | "exists" | "fn" | "time" | "overwrite" | "self" | "none" => true,
@@ -2059,7 +1945,7 @@ mod logsent {
             }
             if self.is_grounded() {
                 let sbj = self.args.as_ref().unwrap();
-                let grfunc = self.clone().into_grounded();
+                let grfunc = self.to_grounded();
                 if context.compare_relation(&grfunc) {
                     let cmp = context.has_relationship(&grfunc);
                     if let Some(false) = *&cmp {
@@ -2082,7 +1968,7 @@ mod logsent {
                         if let Predicate::FreeClsMemb(ref arg) = *arg {
                             if let Some(entity) = assigned.get(&*arg.term) {
                                 if let Some(current) = entity.get_relationship(&grfunc) {
-                                    let a = Grounded::Function(Arc::downgrade(&current.clone()));
+                                    let a = Grounded::Function(Arc::downgrade(&current));
                                     context.push_antecedents(a);
                                     if let Some(time) = current.bms
                                         .newest_date(context.newest_grfact()) {
@@ -2122,15 +2008,14 @@ mod logsent {
                        _: &HashMap<&Var, Arc<BmsWrapper>>,
                        context: &mut T)
                        -> Option<bool> {
+            let assigned = assignments.as_ref();
             for a in &self.args {
                 match *a {
                     Predicate::FreeClsMemb(ref free) => {
-                        if assignments.is_none() {
-                            return None;
-                        }
-                        if let Some(entity) = assignments.as_ref().unwrap().get(&*free.term) {
+                        let entity = assigned.and_then(|assigned| assigned.get(&*free.term));
+                        if let Some(entity) = entity {
                             if let Some(current) = entity.get_class(free.parent.get_name()) {
-                                context.push_antecedents(Grounded::Class(Arc::downgrade(&current.clone())));
+                                context.push_antecedents(Grounded::Class(Arc::downgrade(&current)));
                                 if let Some(time) = current.bms
                                     .as_ref()
                                     .unwrap()
@@ -2159,7 +2044,7 @@ mod logsent {
                         } else {
                             let entity = agent.get_obj_from_class(self.get_name(), &compare.term);
                             if let Some(current) = entity {
-                                let grounded = Grounded::Class(Arc::downgrade(&current.clone()));
+                                let grounded = Grounded::Class(Arc::downgrade(&current));
                                 context.push_antecedents(grounded);
                                 if let Some(time) = current.bms
                                     .as_ref()
@@ -2187,10 +2072,11 @@ mod logsent {
                       time_assign: &HashMap<&Var, Arc<BmsWrapper>>,
                       context: &mut T) {
             let time_data = self.get_own_time_data(time_assign, None);
+            let assigned = assignments.as_ref();
             for a in &self.args {
                 let grfact = match *a {
                     Predicate::FreeClsMemb(ref free) => {
-                        if let Some(entity) = assignments.as_ref().unwrap().get(&*free.term) {
+                        if let Some(entity) = assigned.unwrap().get(&*free.term) {
                             GroundedMemb::from_free(free, entity.name)
                         } else {
                             break;
@@ -2199,9 +2085,9 @@ mod logsent {
                     Predicate::GroundedMemb(ref grounded) => grounded.clone(),
                     _ => return, // this path won't be taken in any program
                 };
-                let t = time_data.clone();
-                t.replace_last_val(grfact.get_value());
-                grfact.overwrite_time_data(&t);
+                // copy straight into the fact records and fix the value there,
+                // instead of going through a per argument clone of the time data
+                grfact.overwrite_time_data(&time_data);
                 context.push_grounded_cls(grfact.clone(),
                                           grfact.bms.as_ref().unwrap().get_last_date());
                 agent.up_membership(Arc::new(grfact), Some(context))
@@ -34,7 +34,9 @@ pub(crate) struct LogSentence {
     vars: Option<Vec<Arc<Var>>>,
     skolem: Option<Vec<Arc<Skolem>>>,
     root: Option<Rc<Particle>>,
-    predicates: (Vec<Rc<Assert>>, Vec<Rc<Assert>>),
+    // lhs predicates followed by the rhs ones, split at `lhs_len`
+    predicates: Vec<Rc<Assert>>,
+    lhs_len: usize,
     pub has_time_vars: usize,
     pub created: Time,
     id: Option<SentID>,
@@ -51,7 +53,8 @@ impl<'a> LogSentence {
             skolem: None,
             vars: None,
             root: None,
-            predicates: (vec![], vec![]),
+            predicates: vec![],
+            lhs_len: 0,
             has_time_vars: 0,
             created: UTC::now(),
             id: None,
@@ -71,23 +74,20 @@ impl<'a> LogSentence {
         if context.iexpr() {
             let mut lhs: Vec<Rc<Particle>> = vec![];
             correct_iexpr(&sent, &mut lhs)?;
+            // classify every atom as belonging to the lhs or the rhs in a single pass
             let lhs: HashSet<_> = lhs.iter().map(|x| &**x as *const Particle).collect();
-            let rhs: HashSet<_> = sent.particles
-                .iter()
-                .filter(|x| x.is_atom())
-                .map(|x| &**x as *const Particle)
-                .collect();
-            let rhs_v: Vec<_> = rhs.difference(&lhs)
-                .map(|p| unsafe { &**p })
-                .filter(|p| p.is_atom())
-                .map(|p| p.clone_pred())
-                .collect();
-            let lhs_v: Vec<_> = lhs.iter()
-                .map(|p| unsafe { &**p })
-                .filter(|p| p.is_atom())
-                .map(|p| p.clone_pred())
-                .collect();
-            sent.predicates = (lhs_v, rhs_v);
+            let mut preds = Vec::with_capacity(sent.particles.len());
+            let mut rhs = vec![];
+            for p in sent.particles.iter().filter(|x| x.is_atom()) {
+                if lhs.contains(&(&**p as *const Particle)) {
+                    preds.push(p.clone_pred());
+                } else {
+                    rhs.push(p.clone_pred());
+                }
+            }
+            sent.lhs_len = preds.len();
+            preds.append(&mut rhs);
+            sent.predicates = preds;
             sent.iexpr_op_arg_validation()?;
             if sent.vars.is_some() {
                 let mut is_normal = false;
@@ -118,7 +118,8 @@ impl<'a> LogSentence {
                 .filter(|p| p.is_atom())
                 .map(|p| p.clone_pred())
                 .collect();
-            sent.predicates = (preds, vec![]);
+            sent.lhs_len = preds.len();
+            sent.predicates = preds;
             context.stype = SentKind::Rule;
             sent.sent_kind = SentKind::Rule;
         }
@@ -128,7 +129,7 @@ impl<'a> LogSentence {
 
     fn iexpr_op_arg_validation(&self) -> Result<(), LogSentErr> {
         // check validity of optional arguments for predicates in the LHS:
-        for decl in &self.predicates.0 {
+        for decl in self.lhs_preds() {
             match **decl {
                 Assert::FuncDecl(ref func) => {
                     if let Some(ref opargs) = func.op_args {
@@ -161,7 +162,7 @@ impl<'a> LogSentence {
             }
         }
         // check validity of optional arguments for predicates in the RHS:
-        for decl in &self.predicates.1 {
+        for decl in self.rhs_preds() {
             match **decl {
                 Assert::FuncDecl(ref func) => {
                     if let Some(ref opargs) = func.op_args {
@@ -200,9 +201,12 @@ impl<'a> LogSentence {
                                      agent: &agent::Representation,
                                      assignments: Option<HashMap<&Var, &agent::VarAssignment>>,
                                      context: &mut T) {
-        let root = &self.root;
+        let root = self.root.as_ref().unwrap();
+        // indicative conditionals count their time variables when built,
+        // the ones without any never need to look for time assignments
+        let has_time_vars = self.has_time_vars > 0 || !self.sent_kind.is_iexpr();
         let time_assign = {
-            if self.vars.is_some() {
+            if self.vars.is_some() && has_time_vars {
                 self.get_time_assignments(agent, &assignments)
             } else {
                 HashMap::new()
@@ -213,44 +217,19 @@ impl<'a> LogSentence {
             return;
         }
         if self.sent_kind.is_iexpr() {
-            if let Some(res) = root.as_ref()
-                .unwrap()
-                .solve(agent, &assignments, &time_assign, context) {
-                if res {
-                    root.as_ref()
-                        .unwrap()
-                        .substitute(agent, &assignments, &time_assign, context, &false);
-                    context.set_result(Some(true));
-                } else {
-                    root.as_ref()
-                        .unwrap()
-                        .substitute(agent, &assignments, &time_assign, context, &true);
-                    context.set_result(Some(false));
-                }
+            if let Some(res) = root.solve(agent, &assignments, &time_assign, context) {
+                root.substitute(agent, &assignments, &time_assign, context, &!res);
+                context.set_result(Some(res));
             } else {
                 context.set_result(None);
             }
         } else {
-            if let Some(res) = root.as_ref()
-                .unwrap()
-                .solve(agent, &assignments, &time_assign, context) {
-                if res {
-                    if root.as_ref().unwrap().is_icond() {
-                        context.substituting();
-                        root.as_ref()
-                            .unwrap()
-                            .substitute(agent, &assignments, &time_assign, context, &false)
-                    }
-                    context.set_result(Some(true));
-                } else {
-                    if root.as_ref().unwrap().is_icond() {
-                        context.substituting();
-                        root.as_ref()
-                            .unwrap()
-                            .substitute(agent, &assignments, &time_assign, context, &true)
-                    }
-                    context.set_result(Some(false));
+            if let Some(res) = root.solve(agent, &assignments, &time_assign, context) {
+                if root.is_icond() {
+                    context.substituting();
+                    root.substitute(agent, &assignments, &time_assign, context, &!res)
                 }
+                context.set_result(Some(res));
             } else if !context.is_inconsistent() {
                 context.set_result(None);
             } else {
@@ -263,11 +242,12 @@ impl<'a> LogSentence {
                             agent: &agent::Representation,
                             var_assign: &Option<HashMap<&Var, &agent::VarAssignment>>)
                             -> HashMap<&Var, Arc<BmsWrapper>> {
-        let mut time_assign = HashMap::new();
+        // the number of time vars is known since the sentence was built
+        let mut time_assign = HashMap::with_capacity(self.has_time_vars);
         'outer: for var in self.vars.as_ref().unwrap() {
             match var.kind {
                 VarKind::Time => {
-                    for pred in &self.predicates.0 {
+                    for pred in self.lhs_preds() {
                         if pred.get_time_decl(&*var) {
                             let times = pred.get_times(agent, var_assign);
                             if times.is_none() {
@@ -303,28 +283,25 @@ impl<'a> LogSentence {
     }
 
     pub fn get_all_predicates(&self) -> Vec<&Assert> {
-        let mut v = self.get_all_lhs_predicates();
-        let mut v_rhs = self.get_rhs_predicates();
-        v.append(&mut v_rhs);
-        v
+        self.predicates.iter().map(|p| &**p as &Assert).collect()
     }
 
     pub fn get_rhs_predicates(&self) -> Vec<&Assert> {
-        let mut v = vec![];
-        for p in &self.predicates.1 {
-            let p = &**p as &Assert;
-            v.push(p);
-        }
-        v
+        self.rhs_preds().iter().map(|p| &**p as &Assert).collect()
     }
 
     pub fn get_all_lhs_predicates(&self) -> Vec<&Assert> {
-        let mut v = vec![];
-        for p in &self.predicates.0 {
-            let p = &**p as &Assert;
-            v.push(p);
-        }
-        v
+        self.lhs_preds().iter().map(|p| &**p as &Assert).collect()
+    }
+
+    #[inline]
+    fn lhs_preds(&self) -> &[Rc<Assert>] {
+        &self.predicates[..self.lhs_len]
+    }
+
+    #[inline]
+    fn rhs_preds(&self) -> &[Rc<Assert>] {
+        &self.predicates[self.lhs_len..]
     }
 
     pub fn get_lhs_predicates(&self) -> LhsPreds {
@@ -335,7 +312,7 @@ impl<'a> LogSentence {
         if self.vars.is_none() {
             self.vars = Some(Vec::new());
         }
-        self.vars.as_mut().unwrap().push(var.clone())
+        self.vars.as_mut().unwrap().push(var)
     }
 
     pub fn get_id(&self) -> usize {
@@ -344,9 +321,9 @@ impl<'a> LogSentence {
 
     fn add_skolem(&mut self, skolem: Arc<Skolem>) {
         if self.skolem.is_none() {
-            self.vars = Some(Vec::new());
+            self.skolem = Some(Vec::new());
         }
-        self.skolem.as_mut().unwrap().push(skolem.clone())
+        self.skolem.as_mut().unwrap().push(skolem)
     }
 
     fn add_particle(&mut self, p: Rc<Particle>) {
@@ -364,10 +341,7 @@ impl<'a> LogSentence {
                 Particle::Equivalence(_) => id.push(2),
                 Particle::Implication(_) => id.push(3),
                 Particle::IndConditional(_) => id.push(4),
-                Particle::Atom(ref p) => {
-                    let mut id_1 = p.generate_uid();
-                    id.append(&mut id_1)
-                }
+                Particle::Atom(ref p) => p.generate_uid(&mut id),
             }
         }
         let mut s = DefaultHasher::new();
@@ -403,28 +377,48 @@ impl<'a> LhsPreds<'a> {
         }
     }
 
-    fn dig(prev: &'a Particle, f: &mut Vec<Vec<&'a Assert>>, curr: &mut Vec<&'a Assert>) {
+    fn dig(root: &'a Particle, f: &mut Vec<Vec<&'a Assert>>, curr: &mut Vec<&'a Assert>) {
         // break up all the assertments into groups of one or more members
-        // depending on whether they are childs of an OR node or not
-        if let Some(lhs) = prev.get_next(0) {
-            if prev.is_disjunction() {
-                LhsPreds::dig(lhs, f, curr);
-                LhsPreds::dig(&*prev.get_next(1).unwrap(), f, curr);
-            } else {
-                let mut nlhs = vec![];
-                let mut nrhs = vec![];
-                LhsPreds::dig(lhs, f, &mut nlhs);
-                LhsPreds::dig(&*prev.get_next(1).unwrap(), f, &mut nrhs);
-                if !nrhs.is_empty() {
-                    f.push(nrhs);
+        // depending on whether they are childs of an OR node or not;
+        // the tree is walked with an explicit stack, groups are indexes into `groups`
+        // and the groups of a non-OR node are flushed once both childs were visited
+        enum Step<'p> {
+            Visit(&'p Particle, usize),
+            Flush(usize, usize),
+        }
+        let mut groups: Vec<Vec<&'a Assert>> = vec![vec![]];
+        let mut stack = vec![Step::Visit(root, 0)];
+        while let Some(step) = stack.pop() {
+            match step {
+                Step::Visit(prev, group) => {
+                    if let Some(lhs) = prev.get_next(0) {
+                        let rhs = prev.get_next(1).unwrap();
+                        if prev.is_disjunction() {
+                            stack.push(Step::Visit(rhs, group));
+                            stack.push(Step::Visit(lhs, group));
+                        } else {
+                            let nlhs = groups.len();
+                            groups.push(vec![]);
+                            groups.push(vec![]);
+                            stack.push(Step::Flush(nlhs, nlhs + 1));
+                            stack.push(Step::Visit(rhs, nlhs + 1));
+                            stack.push(Step::Visit(lhs, nlhs));
+                        }
+                    } else {
+                        groups[group].push(prev.pred_ref())
+                    }
                 }
-                if !nlhs.is_empty() {
-                    f.push(nlhs);
+                Step::Flush(nlhs, nrhs) => {
+                    if !groups[nrhs].is_empty() {
+                        f.push(::std::mem::replace(&mut groups[nrhs], vec![]));
+                    }
+                    if !groups[nlhs].is_empty() {
+                        f.push(::std::mem::replace(&mut groups[nlhs], vec![]));
+                    }
                 }
             }
-        } else {
-            curr.push(prev.pred_ref())
         }
+        curr.append(&mut groups[0]);
     }
 
     /// Iterates the permutations of the sentence variable requeriments.
@@ -493,19 +487,20 @@ impl<'a> ::std::iter::Iterator for SentVarReq<'a> {
     /// Iterates the permutations of the sentence variable requeriments.
     /// This just takes into consideration the LHS variables.
     fn next(&mut self) -> Option<HashMap<&'a Var, Vec<&'a Assert>>> {
+        let sent: &'a LogSentence = self.iter.sent;
+        let vars = match sent.vars {
+            Some(ref vars) => vars,
+            None => return None,
+        };
         if let Some(picks) = self.iter.next() {
-            let mut requeriments = HashMap::new();
-            if self.iter.sent.vars.is_none() {
-                return None;
-            }
-            for var in self.iter.sent.vars.as_ref().unwrap() {
-                let mut var_req = Vec::new();
-                for a in &picks {
-                    if a.contains(var) {
-                        var_req.push(*a)
-                    }
+            let mut requeriments = HashMap::with_capacity(vars.len());
+            for var in vars {
+                // vars without requeriments would be skipped when meeting them,
+                // so don't allocate an entry for them at all
+                let var_req: Vec<_> = picks.iter().filter(|a| a.contains(var)).cloned().collect();
+                if !var_req.is_empty() {
+                    requeriments.insert(&**var, var_req);
                 }
-                requeriments.insert(&**var, var_req);
             }
             Some(requeriments)
         } else {
@@ -792,15 +787,11 @@ impl LogicConjunction {
                                  -> Option<bool> {
         let n0_res = self.next_lhs.solve(agent, assignments, time_assign, context);
         let n1_res = self.next_rhs.solve(agent, assignments, time_assign, context);
-        if n0_res.is_none() | n1_res.is_none() {
-            return None;
-        }
-        if let Some(false) = n0_res {
-            return Some(false);
-        } else if let Some(false) = n1_res {
-            return Some(false);
+        match (n0_res, n1_res) {
+            (None, _) | (_, None) => None,
+            (Some(false), _) | (_, Some(false)) => Some(false),
+            (Some(true), Some(true)) => Some(true),
         }
-        Some(true)
     }
 
     #[inline]
@@ -854,20 +845,18 @@ impl LogicDisjunction {
                                  -> Option<bool> {
         let n0_res = self.next_lhs.solve(agent, assignments, time_assign, context);
         let n1_res = self.next_rhs.solve(agent, assignments, time_assign, context);
-        if n0_res != n1_res {
-            if n0_res.is_some() && n1_res.is_some() {
+        match (n0_res, n1_res) {
+            (Some(false), Some(false)) |
+            (Some(false), None) |
+            (None, Some(false)) => Some(false),
+            (Some(true), Some(false)) |
+            (Some(false), Some(true)) |
+            (Some(true), None) |
+            (None, Some(true)) => {
                 context.set_inconsistent(false);
-            } else if let Some(false) = n0_res {
-                return Some(false);
-            } else if let Some(false) = n1_res {
-                return Some(false);
+                Some(true)
             }
-            context.set_inconsistent(false);
-            Some(true)
-        } else if let Some(false) = n0_res {
-            Some(false)
-        } else {
-            None
+            (Some(true), Some(true)) | (None, None) => None,
         }
     }
 
@@ -940,8 +929,8 @@ impl LogicAtom {
     }
 
     #[inline]
-    fn generate_uid(&self) -> Vec<u8> {
-        self.pred.generate_uid()
+    fn generate_uid(&self, id: &mut Vec<u8>) {
+        self.pred.generate_uid(id)
     }
 }
 
@@ -1364,8 +1353,7 @@ fn walk_ast(ast: &ASTNode,
                 let l = context.vars.len() - v_cnt;
                 let local_vars = context.vars.drain(l..).collect::<Vec<Arc<Var>>>();
                 for v in local_vars {
-                    if context.shadowing_vars.contains_key(&v) {
-                        let (idx, shadowed) = context.shadowing_vars.remove(&v).unwrap();
+                    if let Some((idx, shadowed)) = context.shadowing_vars.remove(&v) {
                         context.vars.insert(idx, shadowed);
                     }
                 }
@@ -1375,8 +1363,7 @@ fn walk_ast(ast: &ASTNode,
                 let l = context.skols.len() - s_cnt;
                 let local_skolem = context.skols.drain(l..).collect::<Vec<Arc<Skolem>>>();
                 for v in local_skolem {
-                    if context.shadowing_skols.contains_key(&v) {
-                        let (idx, shadowed) = context.shadowing_skols.remove(&v).unwrap();
+                    if let Some((idx, shadowed)) = context.shadowing_skols.remove(&v) {
                         context.skols.insert(idx, shadowed);
                     }
                 }
@@ -1485,57 +1472,56 @@ fn walk_ast(ast: &ASTNode,
 fn correct_iexpr(sent: &LogSentence, lhs: &mut Vec<Rc<Particle>>) -> Result<(), LogSentErr> {
 
     fn has_icond_child(p: &Particle) -> Result<(), LogSentErr> {
-        if let Some(n1_0) = p.get_next(0) {
-            if let Particle::IndConditional(_) = *n1_0 {
-                return Err(LogSentErr::IExprEntailLHS);
-            }
-            has_icond_child(&*n1_0)?;
-        }
-        if let Some(n1_1) = p.get_next(1) {
-            if let Particle::IndConditional(_) = *n1_1 {
-                return Err(LogSentErr::IExprEntailLHS);
+        let mut stack = vec![p];
+        while let Some(p) = stack.pop() {
+            for pos in 0..2 {
+                if let Some(next) = p.get_next(pos) {
+                    if next.is_icond() {
+                        return Err(LogSentErr::IExprEntailLHS);
+                    }
+                    stack.push(next);
+                }
             }
-            has_icond_child(&*n1_1)?;
         }
         Ok(())
     }
 
-    fn wrong_operator(p: &Particle) -> Result<(), LogSentErr> {
-        if let Some(n1_0) = p.get_next(0) {
-            // test that the lhs does not include any indicative conditional
-            if n1_0.is_icond() {
-                return Err(LogSentErr::IExprEntailLHS);
+    fn wrong_operator(mut p: &Particle) -> Result<(), LogSentErr> {
+        loop {
+            if let Some(n1_0) = p.get_next(0) {
+                // test that the lhs does not include any indicative conditional
+                if n1_0.is_icond() {
+                    return Err(LogSentErr::IExprEntailLHS);
+                }
+                has_icond_child(&*n1_0)?;
             }
-            has_icond_child(&*n1_0)?;
-        }
-        // test that the rh-most-s does include only icond or 'OR' connectives
-        let mut is_wrong = Ok(());
-        if let Some(n1_1) = p.get_next(1) {
-            match *n1_1 {
-                Particle::IndConditional(_) |
-                Particle::Disjunction(_) |
-                Particle::Conjunction(_) |
-                Particle::Atom(_) => {}
-                _ => return Err(LogSentErr::IExprWrongOp),
+            // test that the rh-most-s does include only icond or 'OR' connectives
+            match p.get_next(1) {
+                Some(n1_1) => {
+                    match *n1_1 {
+                        Particle::IndConditional(_) |
+                        Particle::Disjunction(_) |
+                        Particle::Conjunction(_) |
+                        Particle::Atom(_) => {}
+                        _ => return Err(LogSentErr::IExprWrongOp),
+                    }
+                    p = n1_1;
+                }
+                None => return Ok(()),
             }
-            is_wrong = wrong_operator(&*n1_1);
         }
-        is_wrong
     }
 
     fn get_lhs_preds(p: Rc<Particle>, lhs: &mut Vec<Rc<Particle>>) {
-        if let Some(n1_0) = p.get_next_copy(0) {
-            if let Particle::Atom(_) = *n1_0 {
-                lhs.push(n1_0.clone());
-            }
-            get_lhs_preds(n1_0, lhs);
-            let n1_1 = p.get_next_copy(1).unwrap();
-            if let Particle::Atom(_) = *n1_1 {
-                lhs.push(n1_1.clone());
+        // the tree is walked with an explicit stack, only the leaves are collected
+        let mut stack = vec![p];
+        while let Some(p) = stack.pop() {
+            if let Some(n1_0) = p.get_next_copy(0) {
+                stack.push(p.get_next_copy(1).unwrap());
+                stack.push(n1_0);
+            } else {
+                lhs.push(p);
             }
-            get_lhs_preds(n1_1, lhs)
-        } else {
-            lhs.push(p);
         }
     }
 
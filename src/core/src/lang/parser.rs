@@ -58,23 +58,39 @@ pub(crate) struct Parser;
 impl Parser {
     /// Lexerless (mostly) recursive descent parser. Takes a string and outputs a correct ParseTree.
     pub fn parse(input: &str, tell: bool, thread_num: usize) -> Result<VecDeque<ParseTree>, ParseErrF> {
-        // store is a vec where the sequence of characters after cleaning up comments
-        // will be stored, both have to be extended to 'static lifetime so they can be
-        //use rayon::iter::IntoParallelIterator;
+        if input.is_empty() {
+            return Err(ParseErrF::from(ParseErrB::SyntaxErrorU));
+        }
+        // clean is where the sequence of characters after cleaning up comments will be stored
         let mut clean = vec![];
         let scopes = match Self::p1(input.as_bytes(), &mut clean) {
-            Ok(scopes) => scopes.into_par_iter(),
+            Ok(scopes) => scopes,
             Err(err) => return Err(ParseErrF::from(err)),
         };
         // walk the AST output and, if correct, output a final parse tree
-        let tpool = rayon::ThreadPool::new(rayon::Configuration::new().num_threads(thread_num)).unwrap();
-        let parse_trees: Vec<Result<ParseTree, ParseErrF>> = tpool.install(|| {
+        let parse_trees: Vec<Result<ParseTree, ParseErrF>> = if scopes.len() < 2 {
+            // single statements (as most queries are) don't need a thread pool
+            scopes
+                .into_iter()
+                .map(|ast| ParseTree::process_ast(ast, tell))
+                .collect()
+        } else if thread_num == 0 {
+            // no explicit thread count, share the global pool instead of setting up a new one
             scopes
-                .map(|ast| { 
-                    ParseTree::process_ast(ast, tell)
-                })
+                .into_par_iter()
+                .map(|ast| ParseTree::process_ast(ast, tell))
                 .collect()
-        });
+        } else {
+            let tpool = rayon::ThreadPool::new(rayon::Configuration::new().num_threads(thread_num)).unwrap();
+            tpool.install(|| {
+                scopes
+                    .into_par_iter()
+                    .map(|ast| { 
+                        ParseTree::process_ast(ast, tell)
+                    })
+                    .collect()
+            })
+        };
 
         let mut results: VecDeque<ParseTree> = VecDeque::new();
         for res in parse_trees {
@@ -90,14 +106,20 @@ impl Parser {
     fn p1<'b: 'a, 'a>(input: &'a [u8], p2: &'b mut Vec<u8>) -> Result<Vec<ASTNode<'b>>, ParseErrB<'a>> {
         // clean up every comment to facilitate further parsing
         // TODO: clea up or ignore comments without having to collect over the initial slice
-        let p1 = match remove_comments(input) {
-            IResult::Done(_, done) => done,
-            IResult::Error(nom::Err::Position(_, _)) => return Err(ParseErrB::UnclosedComment),
-            _ => return Err(ParseErrB::SyntaxErrorU),
-        };
-        for s in p1 {
-            for c in s {
-                p2.push(c.clone());
+        let has_comments = input.iter().any(|c| *c == b'#') ||
+                           input.windows(2).any(|w| w == b"/*");
+        if !has_comments && input.len() > 1 {
+            // nothing to clean up, skip the comment removal pass
+            p2.extend_from_slice(input);
+        } else {
+            let p1 = match remove_comments(input) {
+                IResult::Done(_, done) => done,
+                IResult::Error(nom::Err::Position(_, _)) => return Err(ParseErrB::UnclosedComment),
+                _ => return Err(ParseErrB::SyntaxErrorU),
+            };
+            p2.reserve(input.len());
+            for s in p1 {
+                p2.extend_from_slice(s);
             }
         }
         let scopes = get_blocks(&p2[..]);
@@ -338,25 +360,21 @@ fn get_blocks(input: &[u8]) -> IResult<&[u8], Vec<ASTNode>>
         None => return IResult::Done(EMPTY, vec![]),
     };
     // find the positions of the closing delimiters and try until it fails
-    let mut mcd = ::std::collections::VecDeque::new();
+    let mut mcd = vec![];
     let mut lp = 0;
     let mut rp = 0;
-    let mut slp = -1_i64;
+    let mut slp = None;
     for (i, c) in input.iter().enumerate() {
         if *c == b'(' {
             lp += 1;
-            if slp < 0 {
-                slp = i as i64;
+            if slp.is_none() {
+                slp = Some(i);
             }
         } else if *c == b')' {
             rp += 1;
             if rp == lp {
-                if i + 1 < input.len() {
-                    mcd.push_back((slp as usize, i + 1));
-                } else {
-                    mcd.push_back((slp as usize, input.len()));
-                }
-                slp = -1;
+                mcd.push((slp.unwrap(), i + 1));
+                slp = None;
             }
         }
     }
@@ -366,9 +384,8 @@ fn get_blocks(input: &[u8]) -> IResult<&[u8], Vec<ASTNode>>
         return IResult::Error(nom::Err::Position(ErrorKind::Custom(11), input));
     }
 
-    let mut results: Vec<ASTNode> = Vec::new();
-    for _ in 0..mcd.len() {
-        let (lp, rp) = mcd.pop_front().unwrap();
+    let mut results: Vec<ASTNode> = Vec::with_capacity(mcd.len());
+    for (lp, rp) in mcd {
         match scope0(&input[lp..rp]) {
             IResult::Done(_, done) => {
                 match done {
@@ -396,7 +413,7 @@ named!(scope0(&[u8]) -> IResult<&[u8], ASTNode>, ws!(
                 tag!("(") >>
                 vars: opt!(scope_var_decl) >>
                 decl: decl_alt >>
-                op: opt!(map!(logic_operator, LogicOperator::from_bytes)) >>
+                op: opt!(logic_operator) >>
                 next: alt!(assertions | scope0) >>
                 tag!(")") >>
                 (vars, decl, op, next, true)
@@ -407,7 +424,7 @@ named!(scope0(&[u8]) -> IResult<&[u8], ASTNode>, ws!(
                 tag!("(") >>
                 vars: opt!(scope_var_decl) >>
                 next: alt!(assertions | scope0) >>
-                op: opt!(map!(logic_operator, LogicOperator::from_bytes)) >>
+                op: opt!(logic_operator) >>
                 decl: decl_alt >>
                 tag!(")") >>
                 (vars, decl, op, next, false)
@@ -418,7 +435,7 @@ named!(scope0(&[u8]) -> IResult<&[u8], ASTNode>, ws!(
                 tag!("(") >>
                 vars: opt!(scope_var_decl) >>
                 lhs: alt!(assertions | scope0) >> 
-                op: map!(logic_operator, LogicOperator::from_bytes) >> 
+                op: logic_operator >> 
                 rhs: alt!(assertions | scope0) >>
                 tag!(")") >>
                 (vars, lhs, op, rhs)
@@ -540,7 +557,7 @@ named!(assertions(&[u8]) -> IResult<&[u8], ASTNode>,
                 map!(
                     do_parse!(
                         decl: decl_alt >> 
-                        op: map!(logic_operator, LogicOperator::from_bytes) >>
+                        op: logic_operator >>
                         (op, decl)
                     ),  assert_one
                 )
@@ -832,10 +849,7 @@ named!(op_arg <OpArgBorrowed>, ws!(do_parse!(
         map!(terminal, OpArgTermBorrowed::is_terminal )
     ) >>
     c1: opt!(do_parse!(
-        c2: map!(
-            alt!(tag!(">=") | tag!("<=") | tag!("=") | tag!(">") | tag!("<")),
-                 CompOperator::from_chars
-        ) >>
+        c2: comp_operator >>
         term: alt!(
             map!(string, OpArgTermBorrowed::is_string) |
             map!(terminal, OpArgTermBorrowed::is_terminal )
@@ -882,10 +896,7 @@ pub(crate) struct UVal {
 
 named!(uval <UVal>, ws!(do_parse!(
     char!('u') >>
-    op: map!(
-        alt!(tag!(">=") | tag!("<=") | tag!("=") | tag!(">") | tag!("<")),
-             CompOperator::from_chars
-    ) >>
+    op: comp_operator >>
     val: number >>
     (UVal{op: op, val: val}) 
 )));
@@ -900,45 +911,36 @@ pub(crate) enum Number {
 }
 
 fn number(input: &[u8]) -> IResult<&[u8], Number> {
-    let mut float = false;
-    let mut idx = 0_usize;
-    let rest = if (input[0] == b'-') | (input[0] == b'+') {
-        &input[1..]
-    } else {
-        input
+    // a single pass finds the sign, the digits and whether it is a float
+    let (signed, start) = match input.first() {
+        Some(&b'-') => (true, 1),
+        Some(&b'+') => (false, 1),
+        _ => (false, 0),
     };
-    for (x, c) in rest.iter().enumerate() {
-        if is_digit(*c) | (*c == b'.') {
-            if *c == b'.' {
-                float = true;
-            }
-            idx = x + 1;
-        } else if idx > 0 {
+    let mut float = false;
+    let mut end = start;
+    for c in &input[start..] {
+        if *c == b'.' {
+            float = true;
+        } else if !is_digit(*c) {
             break;
-        } else {
-            return IResult::Error(nom::Err::Position(ErrorKind::Custom(1), input));
         }
+        end += 1;
     }
-    if float && (input[0] == b'-') {
-        IResult::Done(&input[idx + 1..],
-                      Number::SignedFloat(<f32>::from_str(str::from_utf8(&input[0..idx + 1])
-                              .unwrap())
-                          .unwrap()))
-    } else if !float && (input[0] == b'-') {
-        IResult::Done(&input[idx + 1..],
-                      Number::SignedInteger(<i32>::from_str(str::from_utf8(&input[0..idx + 1])
-                              .unwrap())
-                          .unwrap()))
-    } else if float {
-        IResult::Done(&input[idx..],
-                      Number::UnsignedFloat(<f32>::from_str(str::from_utf8(&input[0..idx])
-                              .unwrap())
-                          .unwrap()))
-    } else {
-        IResult::Done(&input[idx..],
-                      Number::UnsignedInteger(<u32>::from_str(str::from_utf8(&input[0..idx])
-                              .unwrap())
-                          .unwrap()))
+    if end == start {
+        return IResult::Error(nom::Err::Position(ErrorKind::Custom(1), input));
+    }
+    // the minus sign is kept for parsing, a plus sign is skipped
+    let num = unsafe { str::from_utf8_unchecked(&input[if signed { 0 } else { start }..end]) };
+    let parsed = match (signed, float) {
+        (true, true) => <f32>::from_str(num).ok().map(Number::SignedFloat),
+        (true, false) => <i32>::from_str(num).ok().map(Number::SignedInteger),
+        (false, true) => <f32>::from_str(num).ok().map(Number::UnsignedFloat),
+        (false, false) => <u32>::from_str(num).ok().map(Number::UnsignedInteger),
+    };
+    match parsed {
+        Some(number) => IResult::Done(&input[end..], number),
+        None => IResult::Error(nom::Err::Position(ErrorKind::Custom(1), input)),
     }
 }
 
@@ -983,6 +985,23 @@ fn terminal(input: &[u8]) -> IResult<&[u8], &[u8]> {
     IResult::Done(&input[idx..], &input[0..idx])
 }
 
+// comp_op = ('=' | '<' | '>' | '>=' | '<=') ;
+fn comp_operator(input: &[u8]) -> IResult<&[u8], CompOperator> {
+    // the operator is told from the first two bytes, instead of trying each tag in turn
+    let (op, op_eq) = match input.first() {
+        Some(&b'=') => return IResult::Done(&input[1..], CompOperator::Equal),
+        Some(&b'<') => (CompOperator::Less, CompOperator::LessEqual),
+        Some(&b'>') => (CompOperator::More, CompOperator::MoreEqual),
+        Some(_) => return IResult::Error(nom::Err::Position(ErrorKind::Alt, input)),
+        None => return IResult::Incomplete(nom::Needed::Size(2)),
+    };
+    match input.get(1) {
+        Some(&b'=') => IResult::Done(&input[2..], op_eq),
+        Some(_) => IResult::Done(&input[1..], op),
+        None => IResult::Incomplete(nom::Needed::Size(2)),
+    }
+}
+
 #[derive(Debug, PartialEq, Eq, Clone, Copy, Hash)]
 pub(crate) enum CompOperator {
     Equal,
@@ -993,20 +1012,6 @@ pub(crate) enum CompOperator {
 }
 
 impl CompOperator {
-    fn from_chars(c: &[u8]) -> CompOperator {
-        if c == b"<" {
-            CompOperator::Less
-        } else if c == b">" {
-            CompOperator::More
-        } else if c == b"=" {
-            CompOperator::Equal
-        } else if c == b"<=" {
-            CompOperator::LessEqual
-        } else {
-            CompOperator::MoreEqual
-        }
-    }
-
     #[inline]
     pub fn is_equal(&self) -> bool {
         match *self {
@@ -1015,38 +1020,6 @@ impl CompOperator {
         }
     }
 
-    #[inline]
-    pub fn is_more(&self) -> bool {
-        match *self {
-            CompOperator::More => true,
-            _ => false,
-        }
-    }
-
-    #[inline]
-    pub fn is_less(&self) -> bool {
-        match *self {
-            CompOperator::Less => true,
-            _ => false,
-        }
-    }
-
-    #[inline]
-    pub fn is_more_eq(&self) -> bool {
-        match *self {
-            CompOperator::MoreEqual => true,
-            _ => false,
-        }
-    }
-
-    #[inline]
-    pub fn is_less_eq(&self) -> bool {
-        match *self {
-            CompOperator::LessEqual => true,
-            _ => false,
-        }
-    } 
-
     pub fn generate_uid(&self, id: &mut Vec<u8>) {
         match *self {
             CompOperator::Equal => id.push(1),
@@ -1068,22 +1041,6 @@ pub(crate) enum LogicOperator {
 }
 
 impl LogicOperator {
-    fn from_bytes(m: &[u8]) -> LogicOperator {
-        if m == ICOND_OP {
-            LogicOperator::Entail
-        } else if m == AND_OP {
-            LogicOperator::And
-        } else if m == OR_OP {
-            LogicOperator::Or
-        } else if m == IFF_OP {
-            LogicOperator::Biconditional
-        } else if m == IMPL_OP {
-            LogicOperator::Implication
-        } else {
-            panic!() // will never happen
-        }
-    }
-
     pub fn is_and(&self) -> bool {
         match *self {
             LogicOperator::And => true,
@@ -1099,9 +1056,25 @@ impl LogicOperator {
     }
 }
 
-named!(logic_operator, 
-    ws!(alt!(tag!(":=") | tag!("&&") | tag!("||") | tag!("=>") | tag!("<=>")))
-);
+named!(logic_operator<LogicOperator>, ws!(call!(logic_op)));
+
+fn logic_op(input: &[u8]) -> IResult<&[u8], LogicOperator> {
+    // the first byte is enough to tell which operator could be in the input
+    let (op, tag) = match input.first() {
+        Some(&b':') => (LogicOperator::Entail, ICOND_OP),
+        Some(&b'&') => (LogicOperator::And, AND_OP),
+        Some(&b'|') => (LogicOperator::Or, OR_OP),
+        Some(&b'=') => (LogicOperator::Implication, IMPL_OP),
+        Some(&b'<') => (LogicOperator::Biconditional, IFF_OP),
+        Some(_) => return IResult::Error(nom::Err::Position(ErrorKind::Alt, input)),
+        None => return IResult::Incomplete(nom::Needed::Size(ICOND_OP.len())),
+    };
+    match tag!(input, tag) {
+        IResult::Done(rest, _) => IResult::Done(rest, op),
+        IResult::Incomplete(needed) => IResult::Incomplete(needed),
+        IResult::Error(_) => IResult::Error(nom::Err::Position(ErrorKind::Alt, input)),
+    }
+}
 
 // comment parsing tools:
 named!(remove_comments(&[u8]) -> Vec<&[u8]>,